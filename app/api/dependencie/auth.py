@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.session import get_db, get_async_db
 from app.services.auth_service import AuthService
 from app.crud import user as user_crud
 from app.crud import news as news_crud
@@ -9,11 +10,13 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 security = HTTPBearer()
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     token_data = AuthService.verify_token(credentials.credentials)
+    # Same session as the (sync) route: one pooled connection per request, and
+    # the route's Session.get calls for this user hit the identity map
     user = user_crud.user.get(db, id=token_data.user_id)
     if not user:
         raise HTTPException(
@@ -22,6 +25,40 @@ async def get_current_user(
         )
     return user
 
+def get_current_author(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """
+    get_current_user for routes that respond with what the user writes: the
+    response renders them as the author, deferred avatar included, so it is
+    loaded by the same SELECT
+    """
+    token_data = AuthService.verify_token(credentials.credentials)
+    user = user_crud.user.get(db, id=token_data.user_id, options=user_crud.with_media())
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    get_current_user for async def routes, on their get_async_db session
+    """
+    token_data = AuthService.verify_token(credentials.credentials)
+    user = await user_crud.user.aget(db, id=token_data.user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
+
 async def get_current_verified_user(current_user: dict = Depends(get_current_user)):
     if not current_user.is_verified and not current_user.is_admin:
         raise HTTPException(
@@ -30,6 +67,9 @@ async def get_current_verified_user(current_user: dict = Depends(get_current_use
         )
     return current_user
 
+async def get_current_verified_author(current_user: dict = Depends(get_current_author)):
+    return await get_current_verified_user(current_user)
+
 async def get_current_admin_user(current_user: dict = Depends(get_current_user)):
     if not current_user.is_admin:
         raise HTTPException(
@@ -1,7 +1,14 @@
-from fastapi import Depends, HTTPException, status
+import json
+import re
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Type
 from app.database.session import get_db
 from app.crud import user as user_crud
+from app.core.responses import FastJSONResponse
+from app.crud.base import encode_cursor, decode_cursor
+from app.schemas.fields import dump_trusted
 
 def get_verified_user(author_id: int, db: Session = Depends(get_db)):
     user = user_crud.user.get(db, author_id)
@@ -11,17 +18,130 @@ def get_verified_user(author_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=403, detail="User is not verified to perform this action")
     return user
 
+def get_cursor(cursor: Optional[str] = None) -> Optional[int]:
+    """
+    Decode the opaque ?cursor= of list endpoints into the id to continue before
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    """
+    A full page may have more rows after it: hand out the cursor in X-Next-Cursor
+    """
+    if items and len(items) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(items[-1].id)
+
+def get_fields(schema: Type[BaseModel]) -> Callable[..., Optional[FrozenSet[str]]]:
+    """
+    Dependency parsing ?fields=id,title,... into a validated subset of schema's fields
+    """
+    allowed = set(schema.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return")
+    ) -> Optional[FrozenSet[str]]:
+        if not fields:
+            return None
+        requested = frozenset(f.strip() for f in fields.split(",") if f.strip())
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return requested
+
+    return dependency
+
+def orm_response(schema: Type[BaseModel], content: Any, fields: Optional[FrozenSet[str]] = None) -> FastJSONResponse:
+    """
+    Serialize trusted ORM results (an object or a list) straight to JSON with
+    dump_trusted, skipping the response_model validation pass. The route's
+    response_model still describes the response in the OpenAPI schema.
+    """
+    if isinstance(content, (list, tuple)):
+        return FastJSONResponse(content=[dump_trusted(schema, item, fields) for item in content])
+    return FastJSONResponse(content=dump_trusted(schema, content, fields))
+
+def page_response(
+    schema: Type[BaseModel], items: Sequence, limit: int, fields: Optional[FrozenSet[str]] = None
+) -> FastJSONResponse:
+    """
+    orm_response for a keyset page, with X-Next-Cursor; `fields` restricts
+    the objects to a sparse fieldset
+    """
+    response = orm_response(schema, list(items), fields)
+    set_next_cursor(response, items, limit)
+    return response
+
+CONTENT_KEY = re.compile(r"^[A-Za-z0-9_-]+$")
+
+def _reject_constant(name: str):
+    raise ValueError(name)
+
+def parse_content_value(value: str) -> Any:
+    """
+    A ?content.<key>= value as a JSON scalar (number, true/false, null,
+    "quoted string"), so it matches non-string content values; anything else
+    is taken as a plain string
+    """
+    try:
+        parsed = json.loads(value, parse_constant=_reject_constant)
+    except ValueError:
+        return value
+    return parsed if parsed is None or isinstance(parsed, (str, int, float, bool)) else value
+
+def get_content_filters(
+    request: Request,
+    content_has: List[str] = Query(
+        default=[], description="Only news whose content has this key (repeatable)"
+    ),
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse ?content_has=key (repeatable) and ?content.<key>=value (once per
+    key, value as in parse_content_value; all must match) into keyword
+    arguments for CRUDNews.get_by_content, or None without filters
+    """
+    equals = {}
+    for name, value in request.query_params.multi_items():
+        if not name.startswith("content."):
+            continue
+        key = name[len("content."):]
+        if key in equals:
+            raise HTTPException(status_code=400, detail=f"content.{key} given more than once")
+        equals[key] = parse_content_value(value)
+    if not content_has and not equals:
+        return None
+    invalid = [key for key in [*content_has, *equals] if not CONTENT_KEY.match(key)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid content keys: {', '.join(invalid)}")
+    return {"has": content_has, "equals": equals}
+
 from .dependencie.auth import (
     get_current_user,
+    get_current_user_async,
+    get_current_author,
     get_current_verified_user, 
+    get_current_verified_author,
     get_current_admin_user,
     news_owner_or_admin,
     comment_owner_or_admin
 )
 
 __all__ = [
+    "get_cursor",
+    "set_next_cursor",
+    "get_fields",
+    "orm_response",
+    "page_response",
+    "get_content_filters",
     "get_current_user",
+    "get_current_user_async",
+    "get_current_author",
     "get_current_verified_user",
+    "get_current_verified_author",
     "get_current_admin_user", 
     "news_owner_or_admin",
     "comment_owner_or_admin"
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.database.session import get_db
+from app.database.unit_of_work import UnitOfWorkRoute, commit
 from app.crud import user as user_crud
+from app.services.deletion_service import DeletionService
 from app.api.dependencies import get_current_admin_user
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.post("/users/{user_id}/make-admin")
 def make_user_admin(
@@ -18,7 +20,39 @@ def make_user_admin(
     
     user.is_admin = True
     user.is_verified = True
-    db.commit()
-    db.refresh(user)
+    commit(db)
     
-    return {"message": f"User {user.email} is now an admin"}
\ No newline at end of file
+    return {"message": f"User {user.email} is now an admin"}
+
+def _deletion_status(db: Session, user_id: int) -> dict:
+    state = DeletionService.progress.get(user_id, {})
+    finished = state.get("finished_at") is not None
+    return {
+        "user_id": user_id,
+        "status": "completed" if finished else ("running" if state else "pending"),
+        "deleted": state.get("deleted", {"sessions": 0, "comments": 0, "news": 0}),
+        "remaining": {"sessions": 0, "comments": 0, "news": 0} if finished else DeletionService.remaining(db, user_id),
+        "started_at": state.get("started_at"),
+        "finished_at": state.get("finished_at"),
+    }
+
+@router.get("/deletions")
+def list_deletions(
+    db: Session = Depends(get_db),
+    current_admin = Depends(get_current_admin_user)
+):
+    """
+    Accounts queued for background deletion, plus those completed by this process
+    """
+    user_ids = dict.fromkeys([*DeletionService.pending_user_ids(db), *DeletionService.progress])
+    return [_deletion_status(db, user_id) for user_id in user_ids]
+
+@router.get("/deletions/{user_id}")
+def get_deletion(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_admin = Depends(get_current_admin_user)
+):
+    if user_id not in DeletionService.progress and user_id not in DeletionService.pending_user_ids(db):
+        raise HTTPException(status_code=404, detail="No deletion for this user")
+    return _deletion_status(db, user_id)
@@ -1,17 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt  # Add this import
 from fastapi.security import OAuth2PasswordBearer  # Add th
-from app.database.session import get_db
+from app.database.session import get_db, get_async_db
+from app.database.unit_of_work import UnitOfWorkRoute
 from app.schemas.auth import Token, LoginRequest, RegisterRequest, RefreshRequest, SessionInfo, RegisterResponse, LoginResponse
 from app.schemas.user import User
 from app.services.auth_service import AuthService
 from app.crud import user as user_crud
 from app.core.config import settings  # Add this import
-from app.api.dependencie.auth import get_current_user, get_current_admin_user 
+from app.api.dependencie.auth import get_current_user, get_current_user_async, get_current_admin_user 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.post("/register", response_model=RegisterResponse)
 def register(user_data: RegisterRequest, request: Request, db: Session = Depends(get_db)):
@@ -57,6 +59,8 @@ def register(user_data: RegisterRequest, request: Request, db: Session = Depends
             )
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Registration error: {str(e)}")
         raise HTTPException(
@@ -139,8 +143,10 @@ def get_my_sessions(
     return sessions
 
 @router.get("/check")
-async def check_auth(current_user: User = Depends(get_current_user)):
+async def check_auth(current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     """Check if user is authenticated and return user data"""
+    # avatar is deferred and get_current_user_async doesn't load it
+    await db.refresh(current_user, ["avatar"])
     return current_user
 
 @router.get("/check-admin/{user_id}")
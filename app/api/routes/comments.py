@@ -1,65 +1,113 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import FrozenSet, List, Optional
 from app.database.session import get_db
-from app.schemas.comment import Comment, CommentCreate, CommentUpdate
+from app.database.unit_of_work import UnitOfWorkRoute
+from app.schemas.comment import Comment, CommentCreate, CommentUpdate, CommentBulkDelete
+from app.models.comment import Comment as CommentModel
+from app.core.config import settings
 from app.crud import comment as comment_crud
-from app.api.dependencies import get_current_user
+from app.crud import news as news_crud
+from app.api.dependencies import (
+    get_current_author, get_current_user, get_cursor, get_fields, orm_response, page_response
+)
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.post("/", response_model=Comment)
 def create_comment(
     comment: CommentCreate, 
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_author)
 ):
     """
     Create a new comment - ANY authenticated user can comment
     The author_id is automatically set to the current user
     """
+    # Soft-deleted news can't be commented on (nor counted)
+    if not news_crud.news.exists(db, comment.news_id):
+        raise HTTPException(status_code=404, detail="News not found")
     return comment_crud.comment.create(db, obj_in=comment, author_id=current_user.id)
 
 @router.get("/", response_model=List[Comment])
-def read_comments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_comments(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[int] = Depends(get_cursor),
+    fields: Optional[FrozenSet[str]] = Depends(get_fields(Comment)),
+    db: Session = Depends(get_db)
+):
     """
-    Retrieve a list of all comments.
+    Retrieve a list of all comments, newest first.
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page.
     """
-    return comment_crud.comment.get_all(db, skip=skip, limit=limit)
+    options = comment_crud.comment.fieldset_options(fields) if fields else comment_crud.with_author()
+    items = comment_crud.comment.get_all(
+        db, skip=skip, limit=limit, before_id=cursor, options=options
+    )
+    return page_response(Comment, items, limit, fields)
 
 # IMPORTANT: This more specific route is placed before the general /{comment_id} route
 @router.get("/news/{news_id}", response_model=List[Comment])
-def read_comments_by_news(news_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_comments_by_news(
+    news_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[int] = Depends(get_cursor),
+    fields: Optional[FrozenSet[str]] = Depends(get_fields(Comment)),
+    db: Session = Depends(get_db)
+):
     """
-    Retrieve comments associated with a specific news item.
+    Retrieve comments associated with a specific news item, newest first.
     """
-    return comment_crud.comment.get_by_news(db, news_id=news_id, skip=skip, limit=limit)
+    options = comment_crud.comment.fieldset_options(fields) if fields else comment_crud.with_author()
+    items = comment_crud.comment.get_by_news(
+        db, news_id=news_id, skip=skip, limit=limit, before_id=cursor, options=options
+    )
+    return page_response(Comment, items, limit, fields)
+
+@router.delete("/bulk")
+def delete_comments_bulk(
+    payload: CommentBulkDelete,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Delete many comments in one statement. Non-admins only delete their own;
+    other ids are skipped and not counted.
+    """
+    if len(payload.ids) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+    criteria = () if current_user.is_admin else (CommentModel.author_id == current_user.id,)
+    deleted = comment_crud.comment.delete_many(db, payload.ids, *criteria)
+    return {"message": f"{deleted} comments deleted successfully", "deleted": deleted}
 
 @router.get("/{comment_id}", response_model=Comment)
 def read_comment(comment_id: int, db: Session = Depends(get_db)):
     """
     Retrieve a single comment by its ID.
     """
-    db_comment = comment_crud.comment.get(db, id=comment_id)
+    db_comment = comment_crud.comment.get(db, id=comment_id, options=comment_crud.with_author())
     if db_comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
-    return db_comment
+    return orm_response(Comment, db_comment)
 
 @router.put("/{comment_id}", response_model=Comment)
 def update_comment(
     comment_id: int, 
     comment: CommentUpdate, 
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_author)
 ):
-    db_comment = comment_crud.comment.get(db, id=comment_id)
+    # Only the author or an admin can edit; checked in the UPDATE itself
+    db_comment = comment_crud.comment.update_owned(
+        db, id=comment_id, obj_in=comment, user_id=current_user.id, is_admin=current_user.is_admin
+    )
     if db_comment is None:
-        raise HTTPException(status_code=404, detail="Comment not found")
-    
-    if db_comment.author_id != current_user.id and not current_user.is_admin:
+        if not comment_crud.comment.exists(db, comment_id):
+            raise HTTPException(status_code=404, detail="Comment not found")
         raise HTTPException(status_code=403, detail="Not authorized to edit this comment")
-    
-    return comment_crud.comment.update(db, id=comment_id, obj_in=comment)
+    return db_comment
 
 @router.delete("/{comment_id}")
 def delete_comment(
@@ -70,13 +118,11 @@ def delete_comment(
     """
     Delete a comment. Only the author or an admin can delete.
     """
-    db_comment = comment_crud.comment.get(db, id=comment_id)
-    if db_comment is None:
-        raise HTTPException(status_code=404, detail="Comment not found")
-    
-    # Manual authorization check
-    if db_comment.author_id != current_user.id and not current_user.is_admin:
+    deleted = comment_crud.comment.delete_owned(
+        db, id=comment_id, user_id=current_user.id, is_admin=current_user.is_admin
+    )
+    if not deleted:
+        if not comment_crud.comment.exists(db, comment_id):
+            raise HTTPException(status_code=404, detail="Comment not found")
         raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
-    
-    comment_crud.comment.delete(db, id=comment_id)
     return {"message": "Comment deleted successfully"}
\ No newline at end of file
@@ -1,21 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, FrozenSet, List, Optional
 from app.database.session import get_db
-from app.schemas.news import News, NewsCreate, NewsUpdate
+from app.database.unit_of_work import UnitOfWorkRoute
+from app.schemas.news import News, NewsCreate, NewsUpdate, NewsSearchResult, NewsSummary
 from app.crud import news as news_crud
+from app.crud.base import encode_rank_cursor, decode_rank_cursor
+from app.core.config import settings
 
 # Import the correct dependencies
-from app.api.dependencies import get_current_user, get_current_verified_user
+from app.api.dependencies import (
+    get_current_author, get_current_user, get_current_verified_author,
+    get_cursor, get_fields, get_content_filters,
+    orm_response, page_response
+)
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+# Declared before /{author_id} so "bulk" is not parsed as an author id
+@router.post("/bulk", response_model=List[News])
+def create_news_bulk(
+    news: List[NewsCreate],
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_verified_author)
+):
+    """
+    Create many news items for the current user in one transaction
+    """
+    if len(news) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+    return news_crud.news.create_many(db, objs_in=news, author_id=current_user.id)
 
 @router.post("/{author_id}", response_model=News)
 def create_news(
     author_id: int, 
     news: NewsCreate, 
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_verified_user)
+    current_user = Depends(get_current_verified_author)
 ):
     # Security: Users can only create news for themselves, unless admin
     if current_user.id != author_id and not current_user.is_admin:
@@ -23,37 +44,97 @@ def create_news(
     
     return news_crud.news.create(db, obj_in=news, author_id=author_id)
 
-@router.get("/", response_model=List[News])
-def read_news(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return news_crud.news.get_all(db, skip=skip, limit=limit)
+@router.get("/", response_model=List[NewsSummary])
+def read_news(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[int] = Depends(get_cursor),
+    fields: Optional[FrozenSet[str]] = Depends(get_fields(News)),
+    content_filters: Optional[Dict[str, Any]] = Depends(get_content_filters),
+    db: Session = Depends(get_db)
+):
+    """
+    List news, newest first, with excerpts (the full content is returned by
+    GET /{news_id}, or here with ?fields=...,content). Filter on content with
+    ?content_has=key (repeatable) and ?content.<key>=value (once per key).
+    Values are JSON scalars: ?content.n=1 matches the number 1, true/false
+    and null their JSON values, ?content.n="1" the string "1"; anything else
+    is compared as a string.
+    """
+    options = news_crud.news.fieldset_options(fields) if fields else news_crud.with_author_summary()
+    if content_filters:
+        items = news_crud.news.get_by_content(
+            db, **content_filters, skip=skip, limit=limit, before_id=cursor, options=options
+        )
+    else:
+        items = news_crud.news.get_all(db, skip=skip, limit=limit, before_id=cursor, options=options)
+    if fields:
+        return page_response(News, items, limit, fields)
+    return page_response(NewsSummary, items, limit)
+
+@router.get("/search", response_model=List[NewsSearchResult])
+def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over news titles and content, best match first.
+    Pass X-Next-Cursor back as ?cursor= for the next page.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_rank_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    items = news_crud.news.search(db, q, limit=limit, after=after, options=news_crud.with_author_summary())
+    response = orm_response(NewsSearchResult, items)
+    if len(items) == limit:
+        response.headers["X-Next-Cursor"] = encode_rank_cursor(items[-1].rank, items[-1].id)
+    return response
 
 @router.get("/{news_id}", response_model=News)
 def read_news_item(news_id: int, db: Session = Depends(get_db)):
-    db_news = news_crud.news.get(db, id=news_id)
+    db_news = news_crud.news.get(db, id=news_id, options=news_crud.with_author())
     if db_news is None:
         raise HTTPException(status_code=404, detail="News not found")
-    return db_news
+    return orm_response(News, db_news)
 
-@router.get("/author/{author_id}", response_model=List[News])
-def read_news_by_author(author_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return news_crud.news.get_by_author(db, author_id=author_id, skip=skip, limit=limit)
+@router.get("/author/{author_id}", response_model=List[NewsSummary])
+def read_news_by_author(
+    author_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[int] = Depends(get_cursor),
+    fields: Optional[FrozenSet[str]] = Depends(get_fields(News)),
+    db: Session = Depends(get_db)
+):
+    options = news_crud.news.fieldset_options(fields) if fields else news_crud.with_author_summary()
+    items = news_crud.news.get_by_author(
+        db, author_id=author_id, skip=skip, limit=limit, before_id=cursor, options=options
+    )
+    if fields:
+        return page_response(News, items, limit, fields)
+    return page_response(NewsSummary, items, limit)
 
 @router.put("/{news_id}", response_model=News)
 def update_news(
     news_id: int, 
     news: NewsUpdate, 
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_author)
 ):
-    db_news = news_crud.news.get(db, id=news_id)
+    # Security: Only author or admin can edit news (checked in the UPDATE itself)
+    db_news = news_crud.news.update_owned(
+        db, id=news_id, obj_in=news, user_id=current_user.id, is_admin=current_user.is_admin
+    )
     if db_news is None:
-        raise HTTPException(status_code=404, detail="News not found")
-    
-    # Security: Only author or admin can edit news
-    if db_news.author_id != current_user.id and not current_user.is_admin:
+        if not news_crud.news.exists(db, news_id):
+            raise HTTPException(status_code=404, detail="News not found")
         raise HTTPException(status_code=403, detail="Not authorized to edit this news")
-    
-    return news_crud.news.update(db, id=news_id, obj_in=news)
+    return db_news
 
 @router.delete("/{news_id}")
 def delete_news(
@@ -61,13 +142,12 @@ def delete_news(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    db_news = news_crud.news.get(db, id=news_id)
-    if db_news is None:
-        raise HTTPException(status_code=404, detail="News not found")
-    
-    # Security: Only author or admin can delete news
-    if db_news.author_id != current_user.id and not current_user.is_admin:
+    # Security: Only author or admin can delete news (checked in the DELETE itself)
+    deleted = news_crud.news.delete_owned(
+        db, id=news_id, user_id=current_user.id, is_admin=current_user.is_admin
+    )
+    if not deleted:
+        if not news_crud.news.exists(db, news_id):
+            raise HTTPException(status_code=404, detail="News not found")
         raise HTTPException(status_code=403, detail="Not authorized to delete this news")
-    
-    news_crud.news.delete(db, id=news_id)
     return {"message": "News and associated comments deleted successfully"}
\ No newline at end of file
@@ -2,13 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from fastapi.responses import RedirectResponse
 from app.database.session import get_db
+from app.database.unit_of_work import UnitOfWorkRoute, commit
 from app.schemas.auth import Token
 from app.services.auth_service import AuthService
 from app.crud import user as user_crud
 from app.core.config import settings
 import secrets
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/github/demo")
 async def github_demo():
@@ -69,8 +70,7 @@ async def github_callback(
                 user.github_id = mock_user_data["id"]
                 if not user.avatar:
                     user.avatar = mock_user_data["picture"]
-                db.commit()
-                db.refresh(user)
+                commit(db)
         
         # Create tokens
         access_token = AuthService().create_access_token(data={"sub": user.id})
@@ -1,44 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.session import get_db
+from app.database.unit_of_work import UnitOfWorkRoute
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.crud import user as user_crud
-from app.api.dependencie.auth import get_current_user, get_current_admin_user  
+from app.services.auth_service import AuthService
+from app.services.deletion_service import DeletionService
+from app.api.dependencie.auth import get_current_author, get_current_admin_user
+from app.api.dependencies import get_cursor, orm_response, page_response
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.post("/", response_model=User)
 def create_user(user: UserCreate, db: Session = Depends(get_db)):
     db_user = user_crud.user.get_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return user_crud.user.create(db, obj_in=user)
+    user_dict = {
+        "name": user.name,
+        "email": user.email,
+        "hashed_password": AuthService.get_password_hash(user.password),
+        "avatar": user.avatar
+    }
+    return user_crud.user.create(db, obj_in=user_dict)
 
 @router.get("/", response_model=List[User])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = user_crud.user.get_all(db, skip=skip, limit=limit)
-    return users
+def read_users(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[int] = Depends(get_cursor),
+    db: Session = Depends(get_db)
+):
+    users = user_crud.user.get_all(
+        db, skip=skip, limit=limit, before_id=cursor, options=user_crud.with_media()
+    )
+    return page_response(User, users, limit)
 
 @router.get("/{user_id}", response_model=User)
 def read_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = user_crud.user.get(db, id=user_id)
+    db_user = user_crud.user.get(db, id=user_id, options=user_crud.with_media())
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return db_user
+    return orm_response(User, db_user)
 
 @router.put("/{user_id}", response_model=User)
 def update_user(
     user_id: int,
     user: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_author)
 ):
     # Only admin or the user themselves can update
     if current_user.id != user_id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized to update this user")
     
-    db_user = user_crud.user.get(db, id=user_id)
+    # The response renders the avatar: loaded here (or with current_user)
+    # rather than lazily after the UPDATE
+    db_user = user_crud.user.get(db, id=user_id, options=user_crud.with_media())
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -56,10 +75,17 @@ def update_user(
 @router.delete("/{user_id}")
 def delete_user(
     user_id: int,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    background: bool = False,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
 ):
-    """Delete user - Admin only (with safety checks)"""
+    """
+    Delete user - Admin only (with safety checks).
+    With ?background=true the user is hidden at once and their data is removed
+    in batches by the deletion worker (progress: GET /api/admin/deletions/{user_id}).
+    """
     print(f"🗑️ Attempting to delete user {user_id} by admin {current_admin.email}")
     
     # Safety check 1: Prevent self-deletion
@@ -88,6 +114,16 @@ def delete_user(
             detail="Cannot delete the system administrator account"
         )
     
+    if background:
+        user_crud.user.mark_deleted(db, id=user_id)
+        # Background tasks run after the response, i.e. after the unit of work commits
+        background_tasks.add_task(DeletionService.wake)
+        response.status_code = 202
+        return {
+            "message": f"User {user_id} scheduled for deletion",
+            "progress_url": f"/api/admin/deletions/{user_id}"
+        }
+
     try:
         success = user_crud.user.delete(db, id=user_id)
         if success:
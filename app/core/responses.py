@@ -0,0 +1,38 @@
+import datetime
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used without it
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, datetime.datetime) and obj.utcoffset() == datetime.timedelta(0):
+        return obj.isoformat().replace("+00:00", "Z")
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class of the app: orjson when installed, stdlib json
+    otherwise. Both accept datetimes as well as plain JSON types, so content
+    dumped in python mode doesn't need jsonable_encoder first. Datetimes are
+    written like pydantic does (ISO 8601, UTC as Z).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            # Non-str keys as in json.dumps; orjson writes datetimes natively
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=_default,
+        ).encode("utf-8")
@@ -1,42 +1,291 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+import base64
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, delete, func, insert, inspect, select, update
+from sqlalchemy.orm import Session, joinedload, load_only, undefer
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.base import BaseModel
+from app.database.unit_of_work import commit, acommit
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+def encode_cursor(id: int) -> str:
+    """
+    Opaque keyset cursor pointing after the row with this id
+    """
+    return base64.urlsafe_b64encode(f"id:{id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, value = raw.split(":", 1)
+        if prefix != "id":
+            raise ValueError
+        return int(value)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+def encode_rank_cursor(rank: float, id: int) -> str:
+    """
+    Keyset cursor for lists ordered by (rank DESC, id DESC), e.g. search results
+    """
+    return base64.urlsafe_b64encode(f"rank:{rank!r}:{id}".encode()).decode().rstrip("=")
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, rank, id = raw.split(":", 2)
+        if prefix != "rank":
+            raise ValueError
+        return float(rank), int(id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
 class CRUDBase(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
-    def get(self, db: Session, id: int) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    # Deletes are soft (deleted_at is set) and every read skips soft-deleted
+    # rows, which the partial indexes WHERE deleted_at IS NULL make free.
+    # The purge job removes them physically in batches (purge_many).
+    def _live_criteria(self) -> list:
+        return [self.model.deleted_at.is_(None)]
+
+    def _is_live(self, obj: Optional[ModelType]) -> bool:
+        return obj is not None and obj.deleted_at is None
 
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+    # options are per-call loader options (joinedload/selectinload) for the
+    # relationships the caller will touch, so they don't lazy load row by row
+    def get(self, db: Session, id: int, options: Sequence[Any] = ()) -> Optional[ModelType]:
+        # Session.get answers from the identity map when the row was already
+        # loaded in this request (auth dependency, route, CRUD update...)
+        obj = db.get(self.model, id, options=options)
+        return obj if self._is_live(obj) else None
+
+    def get_all(
+        self, db: Session, skip: int = 0, limit: int = 100,
+        before_id: Optional[int] = None, options: Sequence[Any] = ()
+    ) -> List[ModelType]:
+        query = db.query(self.model).options(*options).filter(*self._live_criteria())
+        return self.paginate(query, skip=skip, limit=limit, before_id=before_id).all()
+
+    def fieldset_options(self, fields: Iterable[str]) -> tuple:
+        """
+        Loader options for a sparse fieldset: SELECT only the requested columns
+        (plus id) and join only the requested relationships
+        """
+        mapper = inspect(self.model)
+        columns = [getattr(self.model, f) for f in fields if f in mapper.columns and f != "id"]
+        options = [load_only(self.model.id, *columns)]
+        for f in fields:
+            if f in mapper.relationships:
+                # Embedded objects are rendered whole, deferred columns included
+                load = joinedload(getattr(self.model, f))
+                for prop in mapper.relationships[f].mapper.column_attrs:
+                    if prop.deferred:
+                        load = load.undefer(prop.class_attribute)
+                options.append(load)
+        return tuple(options)
+
+    def paginate(self, query, skip: int = 0, limit: int = 100, before_id: Optional[int] = None):
+        """
+        Newest first. With before_id (a decoded cursor) the page is found with an
+        index range scan on id instead of skipping `skip` rows.
+        Works for both Query and select().
+        """
+        query = query.order_by(self.model.id.desc())
+        if before_id is not None:
+            query = query.filter(self.model.id < before_id)
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit)
 
     def create(self, db: Session, obj_in: Dict[str, Any]) -> ModelType:
     # Фильтруем None значения
         filtered_data = {k: v for k, v in obj_in.items() if v is not None}
         db_obj = self.model(**filtered_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
-def update(self, db: Session, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
-    db_obj = db.query(self.model).filter(self.model.id == id).first()
-    if db_obj:
-        # Фильтруем None значения и обновляем только существующие атрибуты
-        for field, value in obj_in.items():
-            if value is not None and hasattr(db_obj, field):
-                setattr(db_obj, field, value)
-        db.commit()
-        db.refresh(db_obj)
-    return db_obj
+    def update(self, db: Session, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        db_obj = self.get(db, id)
+        if db_obj:
+            # Фильтруем None значения и обновляем только существующие атрибуты
+            for field, value in obj_in.items():
+                if value is not None and hasattr(db_obj, field):
+                    setattr(db_obj, field, value)
+            commit(db)
+        return db_obj
 
     def delete(self, db: Session, id: int) -> Optional[ModelType]:
-        db_obj = db.query(self.model).filter(self.model.id == id).first()
+        db_obj = self.get(db, id)
         if db_obj:
-            db.delete(db_obj)
-            db.commit()
-        return db_obj
\ No newline at end of file
+            db_obj.deleted_at = datetime.now(timezone.utc)
+            commit(db)
+        return db_obj
+
+    def soft_delete_statement(self, *criteria):
+        return (
+            update(self.model)
+            .where(*criteria, *self._live_criteria())
+            .values(deleted_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    def exists(self, db: Session, id: int) -> bool:
+        return db.query(
+            select(self.model.id).filter(self.model.id == id, *self._live_criteria()).exists()
+        ).scalar()
+
+    # Ownership-checked writes for models with an author_id: the permission
+    # check is part of the WHERE clause, so each is a single statement.
+    # None/False means no row matched; use exists() to tell 404 from 403.
+    def _owned(self, id: int, user_id: int, is_admin: bool) -> list:
+        return [self.model.id == id, *self._live_criteria(), *self._authored(user_id, is_admin)]
+
+    def _authored(self, user_id: int, is_admin: bool) -> list:
+        return [] if is_admin else [self.model.author_id == user_id]
+
+    def _returning_options(self) -> tuple:
+        """
+        RETURNING leaves deferred columns out: undefer them on write statements
+        so the returned objects render without a lazy SELECT per row
+        """
+        return tuple(
+            undefer(prop.class_attribute) for prop in inspect(self.model).column_attrs if prop.deferred
+        )
+
+    def update_owned(
+        self, db: Session, *, id: int, obj_in: Dict[str, Any], user_id: int, is_admin: bool = False
+    ) -> Optional[ModelType]:
+        stmt = (
+            update(self.model)
+            .where(*self._owned(id, user_id, is_admin))
+            .values(**obj_in)
+            .returning(self.model)
+            .options(*self._returning_options())
+        )
+        db_obj = db.scalars(stmt).first()
+        commit(db)
+        return db_obj
+
+    def delete_owned(self, db: Session, *, id: int, user_id: int, is_admin: bool = False) -> bool:
+        # soft_delete_statement adds the live criteria itself
+        result = db.execute(self.soft_delete_statement(self.model.id == id, *self._authored(user_id, is_admin)))
+        commit(db)
+        return result.rowcount > 0
+
+    # Bulk operations: one transaction, executemany / multi-row VALUES batches
+    # instead of a statement (and commit) per row. They bypass ORM cascades.
+    def create_many(self, db: Session, objs_in: List[Dict[str, Any]]) -> List[ModelType]:
+        if not objs_in:
+            return []
+        # None is dropped only where the column has a default to apply; other
+        # NULLs are rendered (render_nulls) so rows share their keys, and so
+        # one VALUES batch
+        defaulted = {
+            c.key for c in self.model.__table__.columns if c.default is not None or c.server_default is not None
+        }
+        rows = [{k: v for k, v in obj_in.items() if v is not None or k not in defaulted} for obj_in in objs_in]
+        stmt = insert(self.model).returning(self.model).options(*self._returning_options())
+        db_objs = list(db.scalars(stmt, rows, execution_options={"render_nulls": True}))
+        commit(db)
+        return db_objs
+
+    def update_many(self, db: Session, objs_in: List[Dict[str, Any]], touch: bool = True) -> int:
+        """
+        Each dict must contain the primary key "id" plus the columns to change.
+        touch=False keeps updated_at, for maintenance writes (backfills) that
+        don't edit the rows: a Core UPDATE, without the onupdate default.
+        """
+        if not objs_in:
+            return 0
+        if touch:
+            db.execute(update(self.model), objs_in)
+        else:
+            table = self.model.__table__
+            # The other keys of each dict become the SET clause
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("target_id"))
+                .values(updated_at=table.c.updated_at)
+            )
+            db.execute(stmt, [
+                {"target_id": obj_in["id"], **{k: v for k, v in obj_in.items() if k != "id"}} for obj_in in objs_in
+            ])
+        commit(db)
+        return len(objs_in)
+
+    def delete_many(self, db: Session, ids: List[int], *criteria) -> int:
+        """
+        Soft-delete rows by id in a single statement; extra criteria narrow the
+        match (e.g. ownership). Returns the number of deleted rows.
+        """
+        if not ids:
+            return 0
+        result = db.execute(self.soft_delete_statement(self.model.id.in_(ids), *criteria))
+        commit(db)
+        return result.rowcount
+
+    def purgeable_ids(self, db: Session, deleted_before: datetime, limit: int) -> List[int]:
+        return list(db.scalars(
+            select(self.model.id)
+            .where(self.model.deleted_at < deleted_before)
+            .order_by(self.model.deleted_at)
+            .limit(limit)
+        ))
+
+    def purge_many(self, db: Session, ids: List[int]) -> int:
+        """
+        Physically delete rows by id (soft-deleted or not) and commit
+        """
+        if not ids:
+            return 0
+        result = db.execute(
+            delete(self.model).where(self.model.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        commit(db)
+        return result.rowcount
+
+    # Async variants for use with get_async_db. Lazy loading is not available
+    # on an AsyncSession, so relationships the caller needs must be passed
+    # as loader options (e.g. selectinload(News.author)).
+    async def aget(self, db: AsyncSession, id: int, options: Sequence[Any] = ()) -> Optional[ModelType]:
+        result = await db.execute(
+            select(self.model).options(*options).filter(self.model.id == id, *self._live_criteria())
+        )
+        return result.unique().scalars().first()
+
+    async def aget_all(
+        self, db: AsyncSession, skip: int = 0, limit: int = 100,
+        before_id: Optional[int] = None, options: Sequence[Any] = ()
+    ) -> List[ModelType]:
+        result = await db.execute(
+            self.paginate(select(self.model).options(*options).filter(*self._live_criteria()), skip=skip, limit=limit, before_id=before_id)
+        )
+        return list(result.unique().scalars().all())
+
+    async def acreate(self, db: AsyncSession, obj_in: Dict[str, Any]) -> ModelType:
+        filtered_data = {k: v for k, v in obj_in.items() if v is not None}
+        db_obj = self.model(**filtered_data)
+        db.add(db_obj)
+        await acommit(db)
+        return db_obj
+
+    async def aupdate(self, db: AsyncSession, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        db_obj = await self.aget(db, id=id)
+        if db_obj:
+            for field, value in obj_in.items():
+                if value is not None and hasattr(db_obj, field):
+                    setattr(db_obj, field, value)
+            await acommit(db)
+        return db_obj
+
+    async def adelete(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        db_obj = await self.aget(db, id=id)
+        if db_obj:
+            db_obj.deleted_at = datetime.now(timezone.utc)
+            await acommit(db)
+        return db_obj
@@ -1,21 +1,76 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Sequence
 from app.models.comment import Comment
+from app.models.news import News
 from app.schemas.comment import CommentCreate, CommentUpdate
+from app.database.unit_of_work import commit, acommit
 from .base import CRUDBase
 
+def with_author() -> tuple:
+    """
+    Loader options for the Comment response schema, which embeds the author
+    (with its deferred avatar)
+    """
+    return (joinedload(Comment.author).undefer_group("media"),)
+
+def comment_count_update(deltas: Dict[int, int]):
+    """
+    Statement and executemany params adding deltas {news_id: delta} to
+    News.comment_count. Run it in the same transaction as the comment write.
+    """
+    news = News.__table__
+    stmt = (
+        update(news)
+        .where(news.c.id == bindparam("target_id"))
+        # Keep updated_at: a new comment doesn't edit the article
+        .values(comment_count=news.c.comment_count + bindparam("delta"), updated_at=news.c.updated_at)
+    )
+    return stmt, [{"target_id": news_id, "delta": delta} for news_id, delta in deltas.items()]
+
+def author_comment_deltas(author_id: int):
+    """
+    (news_id, -count) rows for the live comments of an author, to release
+    their counts before the database cascades them away with the author
+    """
+    return (
+        select(Comment.news_id, (-func.count()).label("delta"))
+        .where(Comment.author_id == author_id, Comment.deleted_at.is_(None))
+        .group_by(Comment.news_id)
+    )
+
 class CRUDComment(CRUDBase[Comment]):
-    def get_by_news(self, db: Session, news_id: int, skip: int = 0, limit: int = 100) -> List[Comment]:
-        return db.query(Comment).filter(Comment.news_id == news_id).offset(skip).limit(limit).all()
+    def get_by_news(
+        self, db: Session, news_id: int, skip: int = 0, limit: int = 100,
+        before_id: Optional[int] = None, options: Sequence[Any] = ()
+    ) -> List[Comment]:
+        query = db.query(Comment).options(*options).filter(Comment.news_id == news_id, *self._live_criteria())
+        return self.paginate(query, skip=skip, limit=limit, before_id=before_id).all()
 
-    def get_by_author(self, db: Session, author_id: int, skip: int = 0, limit: int = 100) -> List[Comment]:
-        return db.query(Comment).filter(Comment.author_id == author_id).offset(skip).limit(limit).all()
+    def get_by_author(
+        self, db: Session, author_id: int, skip: int = 0, limit: int = 100,
+        before_id: Optional[int] = None, options: Sequence[Any] = ()
+    ) -> List[Comment]:
+        query = db.query(Comment).options(*options).filter(Comment.author_id == author_id, *self._live_criteria())
+        return self.paginate(query, skip=skip, limit=limit, before_id=before_id).all()
 
     def create(self, db: Session, obj_in: CommentCreate, author_id: int) -> Comment:  # REMOVED news_id parameter
+        """
+        The news item must exist and be live: callers check it first (404)
+        """
         obj_in_data = obj_in.model_dump()
         obj_in_data['author_id'] = author_id
         # news_id is already in obj_in from the schema
-        return super().create(db, obj_in_data)
+        db_obj = Comment(**obj_in_data)
+        db.add(db_obj)
+        # INSERT first, then the count, committed together
+        db.flush()
+        db.execute(*comment_count_update({obj_in.news_id: 1}))
+        commit(db)
+        return db_obj
 
     def update(self, db: Session, *, id: int, obj_in: CommentUpdate) -> Comment:
         db_obj = self.get(db, id=id)
@@ -27,14 +82,84 @@ class CRUDComment(CRUDBase[Comment]):
                 setattr(db_obj, field, value)
             
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            commit(db)
         return db_obj
     
-    def delete(self, db: Session, id: int) -> Comment:
-        obj = db.query(Comment).get(id)
-        db.delete(obj)
-        db.commit()
+    def update_owned(
+        self, db: Session, *, id: int, obj_in: CommentUpdate, user_id: int, is_admin: bool = False
+    ) -> Optional[Comment]:
+        return super().update_owned(
+            db, id=id, obj_in=obj_in.model_dump(exclude_unset=True), user_id=user_id, is_admin=is_admin
+        )
+
+    def delete(self, db: Session, id: int) -> Optional[Comment]:
+        obj = self.get(db, id=id)
+        if obj:
+            obj.deleted_at = datetime.now(timezone.utc)
+            db.execute(*comment_count_update({obj.news_id: -1}))
+            commit(db)
         return obj
 
+    def delete_owned(self, db: Session, *, id: int, user_id: int, is_admin: bool = False) -> bool:
+        return self.delete_many(db, [id], *self._authored(user_id, is_admin)) > 0
+
+    def delete_many(self, db: Session, ids: List[int], *criteria) -> int:
+        if not ids:
+            return 0
+        # RETURNING tells which news items lose how many comments
+        news_ids = db.scalars(
+            self.soft_delete_statement(Comment.id.in_(ids), *criteria).returning(Comment.news_id)
+        ).all()
+        if news_ids:
+            db.execute(*comment_count_update(
+                {news_id: -count for news_id, count in Counter(news_ids).items()}
+            ))
+        commit(db)
+        return len(news_ids)
+
+    def purge_many(self, db: Session, ids: List[int]) -> int:
+        if not ids:
+            return 0
+        # Live comments still count towards their news; soft-deleted ones were released already
+        rows = db.execute(
+            delete(Comment).where(Comment.id.in_(ids)).returning(Comment.news_id, Comment.deleted_at),
+            execution_options={"synchronize_session": False},
+        ).all()
+        live_news_ids = [news_id for news_id, deleted_at in rows if deleted_at is None]
+        if live_news_ids:
+            db.execute(*comment_count_update(
+                {news_id: -count for news_id, count in Counter(live_news_ids).items()}
+            ))
+        commit(db)
+        return len(rows)
+
+    async def acreate(self, db: AsyncSession, obj_in: CommentCreate, author_id: int) -> Comment:
+        obj_in_data = obj_in.model_dump()
+        obj_in_data['author_id'] = author_id
+        db_obj = Comment(**obj_in_data)
+        db.add(db_obj)
+        await db.flush()
+        await db.execute(*comment_count_update({obj_in.news_id: 1}))
+        await acommit(db)
+        return db_obj
+
+    async def aupdate(self, db: AsyncSession, *, id: int, obj_in: CommentUpdate) -> Optional[Comment]:
+        db_obj = await self.aget(db, id=id)
+        if db_obj:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+            for field, value in update_data.items():
+                setattr(db_obj, field, value)
+
+            await acommit(db)
+        return db_obj
+
+    async def adelete(self, db: AsyncSession, id: int) -> Optional[Comment]:
+        db_obj = await self.aget(db, id=id)
+        if db_obj:
+            db_obj.deleted_at = datetime.now(timezone.utc)
+            await db.execute(*comment_count_update({db_obj.news_id: -1}))
+            await acommit(db)
+        return db_obj
+
 comment = CRUDComment(Comment)
\ No newline at end of file
@@ -1,39 +1,259 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import html
+import json
+from sqlalchemy.orm import Session, joinedload, undefer, undefer_group
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Float, cast, column, func, literal_column, select, table, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from app.models.news import News
+from app.models.comment import Comment
 from app.schemas.news import NewsCreate, NewsUpdate
+from app.database.unit_of_work import commit, acommit
 from .base import CRUDBase
+from . import comment as comment_crud
+
+# SQLite FTS5 search table, created with the news table (see models/news.py)
+news_fts = table("news_fts", column("rowid"))
+
+def with_author() -> tuple:
+    """
+    Loader options for the News response schema, which renders the deferred
+    body columns and embeds the author (with its avatar)
+    """
+    return (undefer_group("body"), joinedload(News.author).undefer_group("media"))
+
+def with_author_summary() -> tuple:
+    """
+    Loader options for NewsSummary lists: the cover but not the content
+    """
+    return (undefer(News.cover), joinedload(News.author).undefer_group("media"))
+
+# The database marks search matches with these control characters, which
+# survive HTML escaping and are then replaced by <b>/</b> (highlight_html)
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+def highlight_html(text: Optional[str]) -> str:
+    """
+    Search headline as safe HTML: user text escaped, matches in <b>...</b>
+    """
+    return html.escape(text or "").replace(HIGHLIGHT_START, "<b>").replace(HIGHLIGHT_STOP, "</b>")
+
+EXCERPT_LENGTH = 200
+
+def make_excerpt(content: Any, length: int = EXCERPT_LENGTH) -> str:
+    """
+    Plain-text teaser of a content document: its "text" value, or else all
+    of its string values, whitespace-collapsed and cut at a word boundary
+    """
+    if isinstance(content, dict) and isinstance(content.get("text"), str):
+        text = content["text"]
+    else:
+        text = " ".join(_strings(content))
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(" ,.;:-") + "…"
+
+def _strings(value: Any):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
 
 class CRUDNews(CRUDBase[News]):
-    def get_by_author(self, db: Session, author_id: int, skip: int = 0, limit: int = 100) -> List[News]:
-        return db.query(News).filter(News.author_id == author_id).offset(skip).limit(limit).all()
+    def get_by_author(
+        self, db: Session, author_id: int, skip: int = 0, limit: int = 100,
+        before_id: Optional[int] = None, options: Sequence[Any] = ()
+    ) -> List[News]:
+        query = db.query(News).options(*options).filter(News.author_id == author_id, *self._live_criteria())
+        return self.paginate(query, skip=skip, limit=limit, before_id=before_id).all()
+
+    def get_by_content(
+        self, db: Session, has: Sequence[str] = (), equals: Optional[Dict[str, Any]] = None,
+        skip: int = 0, limit: int = 100, before_id: Optional[int] = None, options: Sequence[Any] = ()
+    ) -> List[News]:
+        """
+        News whose content has all keys in `has` and the top-level values
+        (JSON scalars) in `equals`. Keys must be plain identifiers (validated
+        by the API).
+        """
+        query = db.query(News).options(*options).filter(
+            *self.content_criteria(db.get_bind().dialect.name, has, equals or {}), *self._live_criteria()
+        )
+        return self.paginate(query, skip=skip, limit=limit, before_id=before_id).all()
+
+    def content_criteria(self, dialect: str, has: Sequence[str], equals: Dict[str, Any]) -> list:
+        if dialect == "postgresql":
+            # ? and @> on JSONB, both served by the GIN index
+            content = type_coerce(News.content, JSONB)
+            criteria = [content.has_key(key) for key in has]
+            if equals:
+                criteria.append(content.contains(equals))
+            return criteria
+        # Generic JSON1 fallback (SQLite): no index, only used in development
+        criteria = [func.json_type(News.content, f'$."{key}"').isnot(None) for key in has]
+        for key, value in equals.items():
+            path = f'$."{key}"'
+            if value is None or isinstance(value, bool):
+                # json_extract gives NULL for null and 1/0 for booleans: match the JSON type
+                criteria.append(func.json_type(News.content, path) == json.dumps(value))
+            else:
+                criteria.append(func.json_extract(News.content, path) == value)
+        return criteria
+
+    def search(
+        self, db: Session, q: str, limit: int = 20,
+        after: Optional[Tuple[float, int]] = None, options: Sequence[Any] = ()
+    ) -> List[News]:
+        """
+        Full-text search over title and content text, best match first.
+        after is the (rank, id) of the last result of the previous page.
+        Results carry rank, title_highlight and snippet attributes (HTML, see
+        highlight_html).
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            page, title_highlight, snippet = self._search_postgresql(q, limit, after)
+        else:
+            page, title_highlight, snippet = self._search_sqlite(q, limit, after)
+            if page is None:
+                return []
+        rows = db.execute(
+            select(News, page.c.rank, title_highlight, snippet)
+            .join(page, page.c.id == News.id)
+            .options(*options)
+            .order_by(page.c.rank.desc(), page.c.id.desc())
+        ).unique().all()
+        results = []
+        for news, rank, news_title_highlight, news_snippet in rows:
+            news.rank = rank
+            news.title_highlight = highlight_html(news_title_highlight)
+            news.snippet = highlight_html(news_snippet)
+            results.append(news)
+        return results
+
+    def _ranked_page(self, query, rank, id, limit: int, after: Optional[Tuple[float, int]]):
+        if after is not None:
+            query = query.where(tuple_(rank, id) < tuple_(*after))
+        return query.order_by(rank.desc(), id.desc()).limit(limit).subquery()
+
+    def _search_postgresql(self, q: str, limit: int, after: Optional[Tuple[float, int]]):
+        # news.search_vector is the generated, GIN-indexed tsvector (see models/news.py)
+        query = func.websearch_to_tsquery("english", q)
+        vector = literal_column("news.search_vector")
+        rank = cast(func.ts_rank_cd(vector, query), Float)
+        page = self._ranked_page(
+            select(News.id, rank.label("rank")).where(vector.op("@@")(query), *self._live_criteria()),
+            rank, News.id, limit, after
+        )
+        # Headlines are computed for the page only, in the outer query
+        content_text = literal_column(
+            "(SELECT string_agg(value #>> '{}', ' ') "
+            "FROM jsonb_path_query(news.content, 'strict $.** ? (@.type() == \"string\")') AS value)"
+        )
+        markers = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}"'
+        title_highlight = func.ts_headline("english", News.title, query, f"HighlightAll=true, {markers}")
+        snippet = func.ts_headline(
+            "english", content_text, query, f"MaxFragments=2, MaxWords=20, MinWords=5, {markers}"
+        )
+        return page, title_highlight, snippet
+
+    def _search_sqlite(self, q: str, limit: int, after: Optional[Tuple[float, int]]):
+        # FTS5 query of quoted terms: implicit AND, no syntax errors from user input
+        terms = ['"' + term.replace('"', '""') + '"' for term in q.split()]
+        if not terms:
+            return None, None, None
+        fts = literal_column(news_fts.name)
+        rowid = news_fts.c.rowid
+        # bm25 is lower-is-better; negate so both backends rank descending. Title weighs more.
+        rank = -func.bm25(fts, 10.0, 1.0)
+        page = self._ranked_page(
+            select(
+                rowid.label("id"),
+                rank.label("rank"),
+                func.highlight(fts, 0, HIGHLIGHT_START, HIGHLIGHT_STOP).label("title_highlight"),
+                func.snippet(fts, 1, HIGHLIGHT_START, HIGHLIGHT_STOP, "…", 16).label("snippet"),
+            )
+            .select_from(news_fts)
+            .join(News, News.id == rowid)
+            .where(fts.op("MATCH")(" ".join(terms)), *self._live_criteria()),
+            rank, rowid, limit, after
+        )
+        return page, page.c.title_highlight, page.c.snippet
+
+    # excerpt is derived from content whenever content is written
+    def _with_excerpt(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if data.get("content") is not None:
+            data["excerpt"] = make_excerpt(data["content"])
+        return data
 
     def create(self, db: Session, obj_in: NewsCreate, author_id: int) -> News:
-        obj_in_data = obj_in.model_dump()
+        obj_in_data = self._with_excerpt(obj_in.model_dump())
         obj_in_data['author_id'] = author_id
         return super().create(db, obj_in_data)
 
+    def create_many(self, db: Session, objs_in: List[NewsCreate], author_id: int) -> List[News]:
+        return super().create_many(
+            db, [{**self._with_excerpt(obj_in.model_dump()), "author_id": author_id} for obj_in in objs_in]
+        )
+
     def update(self, db: Session, *, id: int, obj_in: NewsUpdate) -> News:
         db_obj = self.get(db, id=id)
         if db_obj:
             # Convert Pydantic model to dict, exclude unset values
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = self._with_excerpt(obj_in.dict(exclude_unset=True))
             
             for field, value in update_data.items():
                 setattr(db_obj, field, value)
             
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            commit(db)
         return db_obj
     
+    def update_owned(
+        self, db: Session, *, id: int, obj_in: NewsUpdate, user_id: int, is_admin: bool = False
+    ) -> Optional[News]:
+        return super().update_owned(
+            db, id=id, obj_in=self._with_excerpt(obj_in.model_dump(exclude_unset=True)),
+            user_id=user_id, is_admin=is_admin
+        )
+
     def get_with_author(self, db: Session, id: int) -> Optional[News]:
-        return db.query(News).filter(News.id == id).first()
-    
-    def delete(self, db: Session, id: int) -> News:
-        obj = db.query(News).get(id)
-        db.delete(obj)
-        db.commit()
-        return obj
+        return db.query(News).filter(News.id == id, *self._live_criteria()).first()
+
+    # Comments of a deleted article are soft-deleted with it, in one UPDATE
+    def delete(self, db: Session, id: int) -> Optional[News]:
+        db.execute(comment_crud.comment.soft_delete_statement(Comment.news_id == id))
+        return super().delete(db, id)
+
+    def delete_owned(self, db: Session, *, id: int, user_id: int, is_admin: bool = False) -> bool:
+        owned_news = select(News.id).where(*self._owned(id, user_id, is_admin))
+        db.execute(comment_crud.comment.soft_delete_statement(Comment.news_id.in_(owned_news)))
+        return super().delete_owned(db, id=id, user_id=user_id, is_admin=is_admin)
+
+    async def adelete(self, db: AsyncSession, id: int) -> Optional[News]:
+        await db.execute(comment_crud.comment.soft_delete_statement(Comment.news_id == id))
+        return await super().adelete(db, id)
+
+    async def acreate(self, db: AsyncSession, obj_in: NewsCreate, author_id: int) -> News:
+        obj_in_data = self._with_excerpt(obj_in.model_dump())
+        obj_in_data['author_id'] = author_id
+        return await super().acreate(db, obj_in_data)
+
+    async def aupdate(self, db: AsyncSession, *, id: int, obj_in: NewsUpdate) -> Optional[News]:
+        db_obj = await self.aget(db, id=id)
+        if db_obj:
+            update_data = self._with_excerpt(obj_in.model_dump(exclude_unset=True))
+
+            for field, value in update_data.items():
+                setattr(db_obj, field, value)
+
+            await acommit(db)
+        return db_obj
 
 news = CRUDNews(News)
\ No newline at end of file
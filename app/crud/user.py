@@ -1,19 +1,41 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserUpdate, normalize_email
+from app.database.unit_of_work import commit, acommit
 from .base import CRUDBase
+from .comment import author_comment_deltas, comment_count_update
+
+def with_media() -> tuple:
+    """
+    Loader options for the User response schema, which renders the deferred avatar
+    """
+    return (undefer_group("media"),)
 
 class CRUDUser(CRUDBase[User]):
     def get_by_email(self, db: Session, email: str) -> Optional[User]:
-        return db.query(User).filter(User.email == email).first()
+        # lower(email) = ? is an index lookup on uq_users_email_lower
+        return db.query(User).filter(
+            func.lower(User.email) == normalize_email(email), *self._live_criteria()
+        ).first()
 
     def get_by_github_id(self, db: Session, github_id: str) -> Optional[User]:
-        return db.query(User).filter(User.github_id == github_id).first()
+        return db.query(User).filter(User.github_id == github_id, *self._live_criteria()).first()
+
+    def mark_deleted(self, db: Session, id: int) -> bool:
+        """
+        Hide the user now; DeletionService removes the account and its data later
+        """
+        result = db.execute(self.soft_delete_statement(User.id == id))
+        commit(db)
+        return result.rowcount > 0
 
     def create(self, db: Session, obj_in: dict) -> User:
         # Удаляем None значения чтобы избежать ошибок с БД
         obj_in_data = {k: v for k, v in obj_in.items() if v is not None}
+        obj_in_data["email"] = normalize_email(obj_in_data["email"])
         return super().create(db, obj_in_data)
 
     def update(self, db: Session, *, id: int, obj_in: UserUpdate) -> User:
@@ -26,15 +48,51 @@ class CRUDUser(CRUDBase[User]):
                 setattr(db_obj, field, value)
             
             db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
+            commit(db)
         return db_obj
     
     def delete(self, db: Session, *, id: int) -> bool:
         user = db.query(User).filter(User.id == id).first()
         if user:
+            # News, comments and sessions go with the user via ON DELETE CASCADE
+            deltas = dict(db.execute(author_comment_deltas(id)).all())
+            if deltas:
+                db.execute(*comment_count_update(deltas))
             db.delete(user)
-            db.commit()
+            commit(db)
+            return True
+        return False
+
+    async def aget_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
+        result = await db.execute(
+            select(User).filter(func.lower(User.email) == normalize_email(email), *self._live_criteria())
+        )
+        return result.scalars().first()
+
+    async def acreate(self, db: AsyncSession, obj_in: dict) -> User:
+        obj_in_data = {k: v for k, v in obj_in.items() if v is not None}
+        obj_in_data["email"] = normalize_email(obj_in_data["email"])
+        return await super().acreate(db, obj_in_data)
+
+    async def aupdate(self, db: AsyncSession, *, id: int, obj_in: UserUpdate) -> Optional[User]:
+        db_obj = await self.aget(db, id=id)
+        if db_obj:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+            for field, value in update_data.items():
+                setattr(db_obj, field, value)
+
+            await acommit(db)
+        return db_obj
+
+    async def adelete(self, db: AsyncSession, *, id: int) -> bool:
+        user = await self.aget(db, id=id)
+        if user:
+            deltas = dict((await db.execute(author_comment_deltas(id))).all())
+            if deltas:
+                await db.execute(*comment_count_update(deltas))
+            await db.delete(user)
+            await acommit(db)
             return True
         return False
 
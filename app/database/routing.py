@@ -0,0 +1,90 @@
+import random
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import Delete, Insert, Select, Update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Set on responses to requests that wrote, for REPLICA_STICKY_SECONDS: the
+# client's next requests read from the primary, whichever worker or instance
+# serves them (see unit_of_work.UnitOfWorkRoute and session.track_request_user)
+STICKY_COOKIE = "read_primary"
+
+class WriteTracker:
+    """
+    Remembers when each user last wrote, so their reads can stay on the
+    primary until replicas have caught up (read-your-writes).
+    Kept in process memory, i.e. per worker: it covers clients that don't
+    send cookies back as long as their requests reach the same worker;
+    STICKY_COOKIE covers the others across workers and instances.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._lock = threading.Lock()
+        self._last_write: Dict[int, float] = {}
+
+    def record(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            # Drop expired entries so the map stays bounded by recent writers
+            if len(self._last_write) > 10000:
+                self._last_write = {
+                    uid: ts for uid, ts in self._last_write.items() if now - ts < self.window
+                }
+
+    def is_sticky(self, user_id: int) -> bool:
+        with self._lock:
+            ts = self._last_write.get(user_id)
+        return ts is not None and time.monotonic() - ts < self.window
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a replica and everything else
+    (flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, raw SQL) to the primary.
+    Once a session or its user has written, reads go to the primary as well;
+    the user is info["user_id"] (set by get_db from the request's bearer token).
+    A write also sets info["wrote"], which makes the response set STICKY_COOKIE.
+    Pass info={"use_primary": True} to pin a whole session to the primary.
+    """
+
+    def __init__(
+        self,
+        *args,
+        primary: Engine,
+        replicas: Sequence[Engine] = (),
+        write_tracker: Optional[WriteTracker] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.write_tracker = write_tracker
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._mark_write()
+            return self.primary
+        if self._reads_from_replica(clause):
+            return random.choice(self.replicas)
+        return self.primary
+
+    def _reads_from_replica(self, clause) -> bool:
+        if not self.replicas or self.info.get("use_primary"):
+            return False
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return False
+        user_id = self.info.get("user_id")
+        if user_id is not None and self.write_tracker and self.write_tracker.is_sticky(user_id):
+            return False
+        return True
+
+    def _mark_write(self) -> None:
+        self.info["use_primary"] = True
+        self.info["wrote"] = True
+        user_id = self.info.get("user_id")
+        if user_id is not None and self.write_tracker:
+            self.write_tracker.record(user_id)
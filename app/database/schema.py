@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app.models.base import Base
+# Every model must be registered on Base.metadata before create_all
+from app.models import comment, news, session, user  # noqa: F401
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+def init_schema(engine: Engine) -> None:
+    """
+    Create the schema of an empty database and stamp it with the Alembic head,
+    so `alembic upgrade head` has nothing left to do. Databases that already
+    have tables are left to Alembic (app/migrations) and never touched here.
+    """
+    script = ScriptDirectory(str(MIGRATIONS_DIR))
+    with engine.begin() as conn:
+        tables = inspect(conn).get_table_names()
+        if not tables:
+            Base.metadata.create_all(bind=conn)
+            MigrationContext.configure(conn).stamp(script, "head")
+            print("Database tables created, schema stamped at the latest migration")
+            return
+        if "alembic_version" not in tables:
+            print(
+                "⚠️ Database schema is not managed by Alembic: run `alembic stamp 0000` "
+                "and `alembic upgrade head` to bring it up to date"
+            )
+            return
+        current = MigrationContext.configure(conn).get_current_revision()
+        if current != script.get_current_head():
+            print(f"⚠️ Database schema is at revision {current}: run `alembic upgrade head`")
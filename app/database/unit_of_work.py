@@ -0,0 +1,80 @@
+import math
+from typing import Callable, List
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database.routing import STICKY_COOKIE
+
+# Key in the ASGI scope holding the sessions opened for the current request
+UOW_SCOPE_KEY = "unit_of_work_sessions"
+
+def commit(db: Session) -> None:
+    """
+    Commit the session, or only flush when it is part of a request-scoped
+    unit of work (the route commits once at the end). Server defaults are
+    already loaded by the flush (eager_defaults), so no refresh is needed.
+    """
+    if db.info.get("unit_of_work"):
+        db.flush()
+        return
+    db.commit()
+
+async def acommit(db: AsyncSession) -> None:
+    if db.info.get("unit_of_work"):
+        await db.flush()
+        return
+    await db.commit()
+
+def register_session(request: Request, db) -> bool:
+    """
+    Attach db to the request's unit of work if the route runs one
+    """
+    sessions = request.scope.get(UOW_SCOPE_KEY)
+    if sessions is None:
+        return False
+    db.info["unit_of_work"] = True
+    sessions.append(db)
+    return True
+
+def set_sticky_cookie(response: Response) -> None:
+    """
+    Keep the client's reads on the primary until replicas have its writes
+    """
+    response.set_cookie(
+        STICKY_COOKIE, "1", max_age=math.ceil(settings.REPLICA_STICKY_SECONDS),
+        httponly=True, samesite="lax",
+    )
+
+async def _commit_sessions(sessions: List) -> None:
+    for db in sessions:
+        if isinstance(db, AsyncSession):
+            await db.commit()
+        else:
+            await run_in_threadpool(db.commit)
+
+class UnitOfWorkRoute(APIRoute):
+    """
+    Route that commits all request sessions once, after the endpoint and
+    response serialization succeed and before the response is sent.
+    On an exception or an error status the sessions are closed uncommitted.
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            sessions: List = []
+            request.scope[UOW_SCOPE_KEY] = sessions
+            response = await original_route_handler(request)
+            if response.status_code < 400:
+                await _commit_sessions(sessions)
+                if any(db.info.get("wrote") for db in sessions):
+                    set_sticky_cookie(response)
+            return response
+
+        return route_handler
@@ -3,12 +3,21 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, undefer
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 import os
 import json
 
-from app.database.session import engine, get_db
-from app.models.base import Base
+from app.database.session import (
+    engine, async_engine, replica_engines, async_replica_engines, get_db, get_async_db
+)
+from app.core.responses import FastJSONResponse
+from app.database.pool import get_pool_status
+from app.database.schema import init_schema
+from app.database.unit_of_work import UnitOfWorkRoute
+from app.models.news import News as NewsModel
+from app.models.comment import Comment as CommentModel
 from app.crud import user as user_crud
 from app.crud import news as news_crud
 from app.crud import comment as comment_crud
@@ -16,17 +25,23 @@ from app.schemas.user import UserCreate
 from app.schemas.news import NewsCreate
 from app.schemas.comment import CommentCreate
 from app.services.auth_service import AuthService
+from app.services.deletion_service import DeletionService
+from app.services.partition_service import PartitionService
 
 # Import routers
 from app.api.routes import users, news, comments, auth, oauth, admin
-from app.api.dependencie.auth import get_current_user  # Fixed import path
+from app.api.dependencie.auth import get_current_user_async  # Fixed import path
 
 # Initialize FastAPI app
 app = FastAPI(
     title="News CRUD API",
     description="CRUD API for news, users, and comments with frontend",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson rendering when installed (see app/core/responses.py)
+    default_response_class=FastJSONResponse
 )
+# Routes declared on the app commit their request sessions once, at the end
+app.router.route_class = UnitOfWorkRoute
 
 # CORS middleware
 app.add_middleware(
@@ -35,22 +50,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Create tables and admin user on startup
+# Create tables (empty database only, see init_schema) and admin user on startup
 @app.on_event("startup")
 def create_tables():
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    init_schema(engine)
     
     # Create default admin user if not exists
     create_default_admin()
 
+@app.on_event("startup")
+async def start_deletion_workers():
+    # Removes accounts deleted with ?background=true in batches
+    app.state.deletion_worker = asyncio.create_task(DeletionService.run_worker())
+    # Physically removes old soft-deleted news and comments
+    app.state.purge_worker = asyncio.create_task(DeletionService.run_purge_worker())
+    # Deletes expired refresh sessions
+    app.state.session_sweeper = asyncio.create_task(DeletionService.run_session_sweeper())
+    # Creates next months' comment partitions and drops expired ones
+    app.state.partition_worker = asyncio.create_task(PartitionService.run_worker(engine))
+
+@app.on_event("shutdown")
+async def dispose_engines():
+    app.state.deletion_worker.cancel()
+    app.state.purge_worker.cancel()
+    app.state.session_sweeper.cancel()
+    app.state.partition_worker.cancel()
+    # Close pooled connections (aiosqlite keeps a worker thread per connection)
+    for e in [async_engine, *async_replica_engines]:
+        await e.dispose()
+    for e in [engine, *replica_engines]:
+        e.dispose()
+
 def create_default_admin():
     from app.database.session import SessionLocal
     
-    db = SessionLocal()
+    db = SessionLocal(info={"use_primary": True})
     try:
         admin_email = "admin@news.com"
         existing_admin = user_crud.user.get_by_email(db, email=admin_email)
@@ -121,20 +158,33 @@ async def comments_page(request: Request):
         return templates.TemplateResponse("comments.html", {"request": request})
     return HTMLResponse("<h1>Comments Management</h1><p>Frontend not configured</p>")
 
+# Relationships and deferred columns rendered by the HTML list components.
+# AsyncSession can't lazy load, so they are fetched up front.
+NEWS_LIST_OPTIONS = (undefer(NewsModel.cover), joinedload(NewsModel.author))
+COMMENT_LIST_OPTIONS = (joinedload(CommentModel.author), joinedload(CommentModel.news))
+
 # Health Check
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     try:
         from sqlalchemy import text
-        db.execute(text("SELECT 1"))
-        return {"status": "healthy", "service": "News API", "database": "connected"}
+        await db.execute(text("SELECT 1"))
+        return {"status": "healthy", "service": "News API", "database": "connected", "pool": pool_status()}
     except Exception as e:
-        return {"status": "degraded", "service": "News API", "database": "disconnected", "error": str(e)}
+        return {"status": "degraded", "service": "News API", "database": "disconnected", "error": str(e), "pool": pool_status()}
+
+def pool_status():
+    return {
+        "sync": get_pool_status(engine),
+        "async": get_pool_status(async_engine.sync_engine),
+        "replicas": [get_pool_status(e) for e in replica_engines],
+        "async_replicas": [get_pool_status(e.sync_engine) for e in async_replica_engines],
+    }
 
 # API Routes for Frontend (HTML responses)
 @app.get("/api/users", response_class=HTMLResponse)
-async def get_users_html(request: Request, db: Session = Depends(get_db)):
-    users = user_crud.user.get_all(db)
+async def get_users_html(request: Request, db: AsyncSession = Depends(get_async_db)):
+    users = await user_crud.user.aget_all(db)
     if templates:
         return templates.TemplateResponse("components/user_list.html", {
             "request": request,
@@ -143,8 +193,8 @@ async def get_users_html(request: Request, db: Session = Depends(get_db)):
     return HTMLResponse(f"<p>Users: {len(users)} found</p>")
 
 @app.get("/api/news", response_class=HTMLResponse)
-async def get_news_html(request: Request, db: Session = Depends(get_db)):
-    news = news_crud.news.get_all(db)
+async def get_news_html(request: Request, db: AsyncSession = Depends(get_async_db)):
+    news = await news_crud.news.aget_all(db, options=NEWS_LIST_OPTIONS)
     if templates:
         return templates.TemplateResponse("components/news_list.html", {
             "request": request,
@@ -153,8 +203,8 @@ async def get_news_html(request: Request, db: Session = Depends(get_db)):
     return HTMLResponse(f"<p>News: {len(news)} found</p>")
 
 @app.get("/api/comments", response_class=HTMLResponse)
-async def get_comments_html(request: Request, db: Session = Depends(get_db)):
-    comments = comment_crud.comment.get_all(db)
+async def get_comments_html(request: Request, db: AsyncSession = Depends(get_async_db)):
+    comments = await comment_crud.comment.aget_all(db, options=COMMENT_LIST_OPTIONS)
     if templates:
         return templates.TemplateResponse("components/comment_list.html", {
             "request": request,
@@ -171,10 +221,10 @@ async def create_user_form(
     password: str = Form(...),
     is_verified: bool = Form(False),
     avatar: str = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if user already exists
-    existing_user = user_crud.user.get_by_email(db, email=email)
+    existing_user = await user_crud.user.aget_by_email(db, email=email)
     if existing_user:
         return JSONResponse(
             status_code=400,
@@ -191,8 +241,8 @@ async def create_user_form(
             "avatar": avatar
         }
         
-        user = user_crud.user.create(db, obj_in=user_dict)
-        users = user_crud.user.get_all(db)
+        user = await user_crud.user.acreate(db, obj_in=user_dict)
+        users = await user_crud.user.aget_all(db)
         
         if templates:
             return templates.TemplateResponse("components/user_list.html", {
@@ -212,8 +262,8 @@ async def create_news_form(
     title: str = Form(...),
     content: str = Form(...),
     cover: str = Form(None),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     # Check if user is verified
     if not current_user.is_verified and not current_user.is_admin:
@@ -233,8 +283,8 @@ async def create_news_form(
     
     try:
         news_data = NewsCreate(title=title, content=content_dict, cover=cover)
-        news = news_crud.news.create(db, obj_in=news_data, author_id=current_user.id)
-        news_list = news_crud.news.get_all(db)
+        news = await news_crud.news.acreate(db, obj_in=news_data, author_id=current_user.id)
+        news_list = await news_crud.news.aget_all(db, options=NEWS_LIST_OPTIONS)
         
         if templates:
             return templates.TemplateResponse("components/news_list.html", {
@@ -253,11 +303,11 @@ async def create_comment_form(
     request: Request,
     text: str = Form(...),
     news_id: int = Form(...),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     # Check if news exists
-    news = news_crud.news.get(db, id=news_id)
+    news = await news_crud.news.aget(db, id=news_id)
     if not news:
         return JSONResponse(
             status_code=404,
@@ -265,9 +315,9 @@ async def create_comment_form(
         )
     
     try:
-        comment_data = CommentCreate(text=text)
-        comment = comment_crud.comment.create(db, obj_in=comment_data, news_id=news_id, author_id=current_user.id)
-        comments = comment_crud.comment.get_all(db)
+        comment_data = CommentCreate(text=text, news_id=news_id)
+        comment = await comment_crud.comment.acreate(db, obj_in=comment_data, author_id=current_user.id)
+        comments = await comment_crud.comment.aget_all(db, options=COMMENT_LIST_OPTIONS)
         
         if templates:
             return templates.TemplateResponse("components/comment_list.html", {
@@ -285,8 +335,8 @@ async def create_comment_form(
 @app.delete("/users/{user_id}")
 async def delete_user_html(
     user_id: int, 
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     # Only allow admins or users deleting themselves
     if not current_user.is_admin and current_user.id != user_id:
@@ -295,7 +345,7 @@ async def delete_user_html(
             content={"detail": "Not enough permissions"}
         )
     
-    user = user_crud.user.get(db, id=user_id)
+    user = await user_crud.user.aget(db, id=user_id)
     if not user:
         return JSONResponse(
             status_code=404,
@@ -303,7 +353,7 @@ async def delete_user_html(
         )
     
     try:
-        user_crud.user.delete(db, id=user_id)
+        await user_crud.user.adelete(db, id=user_id)
         return JSONResponse(content={"message": "User deleted successfully"})
     except Exception as e:
         return JSONResponse(
@@ -314,10 +364,10 @@ async def delete_user_html(
 @app.delete("/news/{news_id}")
 async def delete_news_html(
     news_id: int, 
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
-    news = news_crud.news.get(db, id=news_id)
+    news = await news_crud.news.aget(db, id=news_id)
     if not news:
         return JSONResponse(
             status_code=404,
@@ -332,7 +382,7 @@ async def delete_news_html(
         )
     
     try:
-        news_crud.news.delete(db, id=news_id)
+        await news_crud.news.adelete(db, id=news_id)
         return JSONResponse(content={"message": "News deleted successfully"})
     except Exception as e:
         return JSONResponse(
@@ -343,10 +393,10 @@ async def delete_news_html(
 @app.delete("/comments/{comment_id}")
 async def delete_comment_html(
     comment_id: int, 
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
-    comment = comment_crud.comment.get(db, id=comment_id)
+    comment = await comment_crud.comment.aget(db, id=comment_id)
     if not comment:
         return JSONResponse(
             status_code=404,
@@ -361,7 +411,7 @@ async def delete_comment_html(
         )
     
     try:
-        comment_crud.comment.delete(db, id=comment_id)
+        await comment_crud.comment.adelete(db, id=comment_id)
         return JSONResponse(content={"message": "Comment deleted successfully"})
     except Exception as e:
         return JSONResponse(
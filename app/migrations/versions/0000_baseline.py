@@ -0,0 +1,86 @@
+"""baseline
+
+The schema as it was before the revision series: users, news, comments and
+refresh_sessions as Base.metadata.create_all built them. Later revisions
+(0001 onwards) are written against it, so an empty database reaches the
+current schema with `alembic upgrade head`.
+
+A database created by create_all before Alembic managed the schema is at
+this revision: `alembic stamp 0000`, then `alembic upgrade head`.
+
+The DDL is frozen here rather than taken from the models, which keep changing.
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0000'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list:
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        *_base_columns(),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("avatar", sa.Text(), nullable=True),
+        sa.Column("github_id", sa.String(100), nullable=True, unique=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "news",
+        *_base_columns(),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("content", sa.JSON(), nullable=False),
+        sa.Column("cover", sa.Text(), nullable=True),
+        sa.Column("author_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+    )
+    op.create_index("ix_news_id", "news", ["id"])
+
+    op.create_table(
+        "comments",
+        *_base_columns(),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("news_id", sa.Integer(), sa.ForeignKey("news.id"), nullable=False),
+        sa.Column("author_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+    )
+    op.create_index("ix_comments_id", "comments", ["id"])
+
+    op.create_table(
+        "refresh_sessions",
+        *_base_columns(),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("refresh_token", sa.String(512), nullable=False, unique=True),
+        sa.Column("user_agent", sa.String(512), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_refresh_sessions_id", "refresh_sessions", ["id"])
+
+
+def downgrade() -> None:
+    for table in ("refresh_sessions", "comments", "news", "users"):
+        op.drop_table(table)
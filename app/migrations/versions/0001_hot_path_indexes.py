@@ -0,0 +1,47 @@
+"""hot path indexes
+
+Indexes for the foreign key filters used by get_by_author, get_by_news,
+AuthService.get_user_sessions and cascade deletes, on the baseline tables
+of revision 0000.
+
+On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY so the
+tables stay writable during the build.
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = '0000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns). Lists are paginated by id desc, so the filter column
+# is followed by id rather than created_at: one index range scan per page.
+INDEXES = [
+    ("ix_news_author_id_id", "news", ["author_id", "id"]),
+    ("ix_comments_news_id_id", "comments", ["news_id", "id"]),
+    ("ix_comments_author_id_id", "comments", ["author_id", "id"]),
+    ("ix_refresh_sessions_user_id_expires_at", "refresh_sessions", ["user_id", "expires_at"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""news comment_count
+
+Denormalized comment count on news, maintained by CRUDComment. Backfilled
+from the comments table.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "news",
+        sa.Column("comment_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "UPDATE news SET comment_count = "
+        "(SELECT count(*) FROM comments WHERE comments.news_id = news.id)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("news") as batch_op:
+        batch_op.drop_column("comment_count")
@@ -0,0 +1,53 @@
+"""news content jsonb
+
+On PostgreSQL, store news.content as JSONB and add a GIN index for the
+content_has / content.<key> filters of /api/news/. Other databases keep the
+generic JSON column.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.alter_column(
+        "news", "content",
+        type_=postgresql.JSONB(), existing_type=sa.JSON(), existing_nullable=False,
+        postgresql_using="content::jsonb",
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_content_gin", "news", ["content"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_news_content_gin", table_name="news",
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.alter_column(
+        "news", "content",
+        type_=sa.JSON(), existing_type=postgresql.JSONB(), existing_nullable=False,
+        postgresql_using="content::json",
+    )
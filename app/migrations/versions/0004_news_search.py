@@ -0,0 +1,76 @@
+"""news full-text search
+
+PostgreSQL: generated tsvector column news.search_vector (title weight A,
+content string values weight B) with a GIN index built concurrently.
+Adding a stored generated column rewrites the news table.
+
+SQLite: FTS5 table news_fts kept in sync by triggers, backfilled from news.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_BODY = "(SELECT group_concat(value, ' ') FROM json_tree({row}.content) WHERE type = 'text')"
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(jsonb_to_tsvector('english', content, '[\"string\"]'), 'B')) STORED"
+        )
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_news_search_vector", "news", ["search_vector"],
+                postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+            )
+    elif dialect == "sqlite":
+        op.execute("CREATE VIRTUAL TABLE news_fts USING fts5(title, body, tokenize = 'porter unicode61')")
+        op.execute(
+            "INSERT INTO news_fts (rowid, title, body) SELECT id, title, "
+            + FTS_BODY.format(row="news") + " FROM news"
+        )
+        op.execute(
+            "CREATE TRIGGER news_fts_insert AFTER INSERT ON news BEGIN "
+            "INSERT INTO news_fts (rowid, title, body) VALUES (new.id, new.title, "
+            + FTS_BODY.format(row="new") + "); END"
+        )
+        op.execute(
+            "CREATE TRIGGER news_fts_delete AFTER DELETE ON news BEGIN "
+            "DELETE FROM news_fts WHERE rowid = old.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER news_fts_update AFTER UPDATE OF title, content ON news BEGIN "
+            "UPDATE news_fts SET title = new.title, body = "
+            + FTS_BODY.format(row="new") + " WHERE rowid = new.id; END"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                "ix_news_search_vector", table_name="news",
+                postgresql_concurrently=True, if_exists=True,
+            )
+        op.drop_column("news", "search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("news_fts_insert", "news_fts_delete", "news_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS news_fts")
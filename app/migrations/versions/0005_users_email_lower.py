@@ -0,0 +1,42 @@
+"""users email lower index
+
+Store emails lowercased and enforce uniqueness with a unique index on
+lower(email), which get_by_email queries. Replaces the plain unique index
+on email. Fails if two existing accounts differ only by email case; merge
+them first.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE users SET email = lower(trim(email)) WHERE email <> lower(trim(email))")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_users_email_lower", "users", [sa.text("lower(email)")], unique=True,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index("ix_users_email", table_name="users", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email", "users", ["email"], unique=True,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index("uq_users_email_lower", table_name="users", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,105 @@
+"""foreign keys on delete cascade
+
+Recreate the foreign keys of news, comments and refresh_sessions with
+ON DELETE CASCADE, so deleting a user or news item removes its dependents
+in the database (the relationships use passive_deletes).
+
+PostgreSQL: the constraints are dropped and re-added NOT VALID in the
+migration transaction, which holds ACCESS EXCLUSIVE only for these catalog
+changes. The VALIDATEs run after it commits, in an autocommit block, so the
+scan of existing rows takes SHARE UPDATE EXCLUSIVE and doesn't block writes.
+SQLite: the tables are rebuilt in batch mode; the news FTS triggers are
+recreated afterwards since a rebuild drops them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table); PostgreSQL names them <table>_<column>_fkey
+FOREIGN_KEYS = [
+    ("news", "author_id", "users"),
+    ("comments", "news_id", "news"),
+    ("comments", "author_id", "users"),
+    ("refresh_sessions", "user_id", "users"),
+]
+
+# Names given to the unnamed SQLite foreign keys when reflected in batch mode
+SQLITE_NAMING = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+FTS_BODY = "(SELECT group_concat(value, ' ') FROM json_tree({row}.content) WHERE type = 'text')"
+
+
+def _recreate_postgresql(ondelete: Union[str, None]) -> None:
+    action = f" ON DELETE {ondelete}" if ondelete else ""
+    for table, column, referred in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+            f"REFERENCES {referred} (id){action} NOT VALID"
+        )
+    # Commits the swap above, releasing its locks, before the scans
+    with op.get_context().autocommit_block():
+        for table, column, _ in FOREIGN_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+
+def _recreate_sqlite(ondelete: Union[str, None]) -> None:
+    for table in dict.fromkeys(table for table, _, _ in FOREIGN_KEYS):
+        with op.batch_alter_table(table, recreate="always", naming_convention=SQLITE_NAMING) as batch_op:
+            for fk_table, column, referred in FOREIGN_KEYS:
+                if fk_table != table:
+                    continue
+                name = f"fk_{table}_{column}_{referred}"
+                batch_op.drop_constraint(name, type_="foreignkey")
+                batch_op.create_foreign_key(name, referred, [column], ["id"], ondelete=ondelete)
+    _create_sqlite_fts_triggers()
+
+
+def _create_sqlite_fts_triggers() -> None:
+    op.execute("DROP TRIGGER IF EXISTS news_fts_insert")
+    op.execute("DROP TRIGGER IF EXISTS news_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS news_fts_update")
+    op.execute(
+        "CREATE TRIGGER news_fts_insert AFTER INSERT ON news BEGIN "
+        "INSERT INTO news_fts (rowid, title, body) VALUES (new.id, new.title, "
+        + FTS_BODY.format(row="new") + "); END"
+    )
+    op.execute(
+        "CREATE TRIGGER news_fts_delete AFTER DELETE ON news BEGIN "
+        "DELETE FROM news_fts WHERE rowid = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER news_fts_update AFTER UPDATE OF title, content ON news BEGIN "
+        "UPDATE news_fts SET title = new.title, body = "
+        + FTS_BODY.format(row="new") + " WHERE rowid = new.id; END"
+    )
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        _recreate_postgresql("CASCADE")
+    elif dialect == "sqlite":
+        _recreate_sqlite("CASCADE")
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        _recreate_postgresql(None)
+    elif dialect == "sqlite":
+        _recreate_sqlite(None)
@@ -0,0 +1,86 @@
+"""soft delete
+
+Add deleted_at to news, comments and refresh_sessions (users has it since
+0007). The read indexes become partial (WHERE deleted_at IS NULL) so they
+only cover live rows, and partial indexes over soft-deleted rows serve the
+purge job.
+
+On PostgreSQL an index being made partial is built concurrently under a
+temporary name and then swapped in, so reads always have an index.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text("deleted_at IS NULL")
+DELETED = sa.text("deleted_at IS NOT NULL")
+
+# Existing indexes made partial: (name, table, columns)
+REPLACED_INDEXES = [
+    ("ix_news_author_id_id", "news", ["author_id", "id"]),
+    ("ix_comments_news_id_id", "comments", ["news_id", "id"]),
+    ("ix_comments_author_id_id", "comments", ["author_id", "id"]),
+]
+
+# New partial indexes: (name, table, columns, where)
+NEW_INDEXES = [
+    ("ix_news_live_id", "news", ["id"], LIVE),
+    ("ix_comments_live_id", "comments", ["id"], LIVE),
+    ("ix_news_deleted_at", "news", ["deleted_at"], DELETED),
+    ("ix_comments_deleted_at", "comments", ["deleted_at"], DELETED),
+]
+
+
+def _create_index(name, table, columns, where=None) -> None:
+    op.create_index(
+        name, table, columns, postgresql_where=where, sqlite_where=where,
+        postgresql_concurrently=True, if_not_exists=True,
+    )
+
+
+def _replace_index(name, table, columns, where) -> None:
+    if op.get_context().dialect.name == "postgresql":
+        _create_index(f"{name}_new", table, columns, where)
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+    else:
+        op.drop_index(name, table_name=table, if_exists=True)
+        _create_index(name, table, columns, where)
+
+
+def upgrade() -> None:
+    for table in ("news", "comments", "refresh_sessions"):
+        op.add_column(table, sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED_INDEXES:
+            _replace_index(name, table, columns, LIVE)
+        for name, table, columns, where in NEW_INDEXES:
+            _create_index(name, table, columns, where)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in NEW_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        for name, table, columns in REPLACED_INDEXES:
+            _replace_index(name, table, columns, None)
+    for table in ("news", "comments", "refresh_sessions"):
+        if op.get_context().dialect.name == "sqlite":
+            # Native DROP COLUMN (SQLite 3.35+) keeps the news FTS triggers,
+            # which a batch table rebuild would drop
+            op.execute(f"ALTER TABLE {table} DROP COLUMN deleted_at")
+        else:
+            op.drop_column(table, "deleted_at")
@@ -0,0 +1,158 @@
+"""comments partitioning
+
+Optional monthly range partitioning of comments by created_at, PostgreSQL
+only, applied when asked for explicitly:
+
+    alembic -x comments_partitioned=true upgrade head
+
+The existing table is attached as the partition for everything before next
+month (or the month after its latest row), without copying rows, and PARTITIONS_AHEAD monthly partitions follow
+it. PartitionService then keeps creating them (on any partitioned table) and
+drops expired ones; it never converts the table itself.
+
+Locks: the slow steps run first, each in its own transaction, while the
+table stays readable and writable:
+- filling NULL created_at;
+- NOT NULL and range CHECKs added NOT VALID, then VALIDATEd;
+- the unique (id, created_at) index, built CONCURRENTLY.
+The ACCESS EXCLUSIVE part that follows only renames, creates the empty
+partitioned table, and attaches the old table. The validated CHECK spares the
+attach a scan, and the existing indexes and foreign keys are attached rather
+than rebuilt.
+
+The primary key becomes (id, created_at), as required for partitioned
+tables; ids stay unique through the shared sequence.
+
+A database already past this revision is converted with
+`alembic stamp 0008`, `alembic -x comments_partitioned=true upgrade 0009`,
+then `alembic stamp head`.
+
+Offline (--sql) runs skip this revision since the layout depends on the
+current date and data.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+
+# Indexes of comments at this revision, recreated on the partitioned table
+INDEXES = [
+    "CREATE INDEX ix_comments_id ON comments (id)",
+    "CREATE INDEX ix_comments_live_id ON comments (id) WHERE deleted_at IS NULL",
+    "CREATE INDEX ix_comments_news_id_id ON comments (news_id, id) WHERE deleted_at IS NULL",
+    "CREATE INDEX ix_comments_author_id_id ON comments (author_id, id) WHERE deleted_at IS NULL",
+    "CREATE INDEX ix_comments_deleted_at ON comments (deleted_at) WHERE deleted_at IS NOT NULL",
+]
+INDEX_NAMES = [statement.split()[2] for statement in INDEXES]
+
+FOREIGN_KEYS = (
+    "ALTER TABLE comments "
+    "ADD CONSTRAINT comments_news_id_fkey FOREIGN KEY (news_id) REFERENCES news (id) ON DELETE CASCADE, "
+    "ADD CONSTRAINT comments_author_id_fkey FOREIGN KEY (author_id) REFERENCES users (id) ON DELETE CASCADE"
+)
+
+
+def _month_start(day: date, months: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_postgresql_online() -> bool:
+    return op.get_context().dialect.name == "postgresql" and not context.is_offline_mode()
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'comments'::regclass)"
+    )))
+
+
+def upgrade() -> None:
+    requested = context.get_x_argument(as_dictionary=True).get("comments_partitioned", "")
+    if requested.lower() not in ("1", "true", "yes") or not _is_postgresql_online() or _is_partitioned():
+        return
+    # The attached table covers everything before next month, or after its
+    # latest row if that is later (e.g. after a downgrade)
+    latest = op.get_bind().scalar(sa.text("SELECT max(created_at) FROM comments"))
+    boundary = _month_start(max(date.today(), latest.date() if latest else date.today()), 1)
+    legacy = f"comments_before_{boundary:%Y%m}"
+
+    # Online preparation: row locks and SHARE UPDATE EXCLUSIVE only. Each
+    # step starts over cleanly if a previous run stopped half way.
+    with op.get_context().autocommit_block():
+        op.execute("UPDATE comments SET created_at = now() WHERE created_at IS NULL")
+        for name, check in (
+            ("comments_created_at_not_null", "created_at IS NOT NULL"),
+            (f"{legacy}_range", f"created_at < '{boundary}'"),
+        ):
+            op.execute(f"ALTER TABLE comments DROP CONSTRAINT IF EXISTS {name}")
+            op.execute(f"ALTER TABLE comments ADD CONSTRAINT {name} CHECK ({check}) NOT VALID")
+            op.execute(f"ALTER TABLE comments VALIDATE CONSTRAINT {name}")
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {legacy}_id_created_at")
+        op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY {legacy}_id_created_at ON comments (id, created_at)")
+
+    # Swap, under ACCESS EXCLUSIVE: catalog changes only, no scans or builds.
+    # The validated CHECK lets SET NOT NULL skip its scan.
+    op.execute("ALTER TABLE comments ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE comments DROP CONSTRAINT comments_created_at_not_null")
+    # Backs the partitioned primary key on this partition
+    op.execute(
+        f"ALTER TABLE comments ADD CONSTRAINT {legacy}_id_created_at_key "
+        f"UNIQUE USING INDEX {legacy}_id_created_at"
+    )
+    op.execute(f"ALTER TABLE comments RENAME TO {legacy}")
+    # Free the index names for the partitioned table
+    op.execute(f"ALTER INDEX comments_pkey RENAME TO {legacy}_pkey")
+    for name in INDEX_NAMES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_{boundary:%Y%m}")
+
+    op.execute(f"CREATE TABLE comments (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+    op.execute("ALTER TABLE comments ADD PRIMARY KEY (id, created_at)")
+    # Same definitions as the old table's, which are attached instead of
+    # being revalidated or rebuilt
+    op.execute(FOREIGN_KEYS)
+    op.execute("ALTER SEQUENCE comments_id_seq OWNED BY comments.id")
+    for statement in INDEXES:
+        op.execute(statement)
+    op.execute(f"ALTER TABLE comments ATTACH PARTITION {legacy} FOR VALUES FROM (MINVALUE) TO ('{boundary}')")
+
+    for offset in range(PARTITIONS_AHEAD):
+        start = _month_start(boundary, offset)
+        op.execute(
+            f"CREATE TABLE comments_p{start:%Y%m} PARTITION OF comments "
+            f"FOR VALUES FROM ('{start}') TO ('{_month_start(start, 1)}')"
+        )
+
+
+def downgrade() -> None:
+    if not _is_postgresql_online() or not _is_partitioned():
+        return
+    # Back to a plain table: this one does copy the rows
+    op.execute("ALTER TABLE comments RENAME TO comments_partitioned")
+    op.execute("ALTER INDEX comments_pkey RENAME TO comments_partitioned_pkey")
+    for name in INDEX_NAMES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+    op.execute("CREATE TABLE comments (LIKE comments_partitioned INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO comments SELECT * FROM comments_partitioned")
+    op.execute("ALTER TABLE comments ALTER COLUMN created_at DROP NOT NULL")
+    op.execute("ALTER TABLE comments ADD PRIMARY KEY (id)")
+    op.execute(FOREIGN_KEYS)
+    op.execute("ALTER SEQUENCE comments_id_seq OWNED BY comments.id")
+    for statement in INDEXES:
+        op.execute(statement)
+    op.execute("DROP TABLE comments_partitioned CASCADE")
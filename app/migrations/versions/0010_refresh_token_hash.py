@@ -0,0 +1,93 @@
+"""refresh token hash
+
+Replace refresh_sessions.refresh_token (raw token, String(512) unique) with
+token_hash, the 32-byte sha256 digest, and index expires_at for the expiry
+sweeper. Existing sessions keep working: their digests are backfilled.
+
+Downgrade can't recover the tokens, so it deletes every session (users log
+in again).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+sessions = sa.table(
+    "refresh_sessions",
+    sa.column("id", sa.Integer),
+    sa.column("refresh_token", sa.String),
+    sa.column("token_hash", sa.LargeBinary),
+)
+
+
+def _backfill_sqlite() -> None:
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(sessions.c.id, sessions.c.refresh_token)
+            .where(sessions.c.id > last_id)
+            .order_by(sessions.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        conn.execute(
+            sessions.update().where(sessions.c.id == sa.bindparam("target_id")),
+            [{"target_id": id, "token_hash": hashlib.sha256(token.encode()).digest()} for id, token in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.add_column("refresh_sessions", sa.Column("token_hash", sa.LargeBinary(32), nullable=True))
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("UPDATE refresh_sessions SET token_hash = sha256(convert_to(refresh_token, 'UTF8'))")
+        op.alter_column("refresh_sessions", "token_hash", nullable=False)
+        op.create_unique_constraint("refresh_sessions_token_hash_key", "refresh_sessions", ["token_hash"])
+        op.drop_column("refresh_sessions", "refresh_token")
+    else:
+        _backfill_sqlite()
+        with op.batch_alter_table("refresh_sessions", recreate="always") as batch_op:
+            batch_op.alter_column("token_hash", existing_type=sa.LargeBinary(32), nullable=False)
+            batch_op.create_unique_constraint("uq_refresh_sessions_token_hash", ["token_hash"])
+            batch_op.drop_column("refresh_token")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_sessions_expires_at", "refresh_sessions", ["expires_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_refresh_sessions_expires_at", table_name="refresh_sessions",
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.execute("DELETE FROM refresh_sessions")
+    if op.get_context().dialect.name == "postgresql":
+        op.add_column("refresh_sessions", sa.Column("refresh_token", sa.String(512), nullable=False))
+        op.create_unique_constraint("refresh_sessions_refresh_token_key", "refresh_sessions", ["refresh_token"])
+        op.drop_column("refresh_sessions", "token_hash")
+    else:
+        with op.batch_alter_table("refresh_sessions", recreate="always") as batch_op:
+            batch_op.add_column(sa.Column("refresh_token", sa.String(512), nullable=False))
+            batch_op.create_unique_constraint("uq_refresh_sessions_refresh_token", ["refresh_token"])
+            batch_op.drop_column("token_hash")
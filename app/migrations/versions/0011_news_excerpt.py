@@ -0,0 +1,32 @@
+"""news excerpt
+
+Add news.excerpt, the plain-text teaser returned by list endpoints. CRUDNews
+sets it on create/update; fill it for existing rows with
+`python backfill_excerpts.py` after upgrading (list items show no excerpt
+until then).
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("news", sa.Column("excerpt", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    # Native DROP COLUMN on SQLite too: a batch rebuild would drop the news_fts triggers
+    op.drop_column("news", "excerpt")
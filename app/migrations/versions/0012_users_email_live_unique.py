@@ -0,0 +1,52 @@
+"""users email unique among live accounts
+
+uq_users_email_lower becomes partial (WHERE deleted_at IS NULL): an account
+queued for background deletion keeps its row until DeletionService removes
+it, and its email can be registered again meanwhile.
+
+On PostgreSQL the new index is built concurrently under a temporary name and
+then swapped in, so the email stays unique throughout. Downgrading fails
+while a live account and one queued for deletion share an email.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME = "uq_users_email_lower"
+LIVE = sa.text("deleted_at IS NULL")
+
+
+def _replace_index(where) -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.create_index(
+            f"{NAME}_new", "users", [sa.text("lower(email)")], unique=True,
+            postgresql_where=where, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(NAME, table_name="users", postgresql_concurrently=True, if_exists=True)
+        op.execute(f"ALTER INDEX {NAME}_new RENAME TO {NAME}")
+    else:
+        op.drop_index(NAME, table_name="users", if_exists=True)
+        op.create_index(NAME, "users", [sa.text("lower(email)")], unique=True, sqlite_where=where)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        _replace_index(LIVE)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        _replace_index(None)
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy import Column, Integer, DateTime, Index, inspect, text
 from sqlalchemy.sql import func
 import abc
 
@@ -7,9 +7,40 @@ Base = declarative_base()
 
 class BaseModel(Base):
     __abstract__ = True
+    # Fetch server-generated created_at/updated_at in the INSERT/UPDATE itself
+    # (RETURNING on PostgreSQL and SQLite 3.35+) instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Soft delete: CRUDBase reads skip rows with deleted_at set, the purge job
+    # removes them physically later
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __init__(self, **kwargs):
+        # An explicit NULL keeps eager_defaults from re-SELECTing updated_at after INSERT
+        kwargs.setdefault("updated_at", None)
+        # Likewise deferred columns left out (a None cover or avatar): set, they
+        # render from memory instead of a lazy SELECT after the INSERT
+        for prop in inspect(type(self)).column_attrs:
+            if prop.deferred:
+                kwargs.setdefault(prop.key, None)
+        super().__init__(**kwargs)
+
+LIVE_ROWS = text("deleted_at IS NULL")
+DELETED_ROWS = text("deleted_at IS NOT NULL")
+
+def live_index(name: str, *columns: str) -> Index:
+    """
+    Partial index over rows that are not soft-deleted, the only ones CRUDBase reads
+    """
+    return Index(name, *columns, postgresql_where=LIVE_ROWS, sqlite_where=LIVE_ROWS)
+
+def deleted_index(name: str) -> Index:
+    """
+    Partial index over soft-deleted rows, for the purge job
+    """
+    return Index(name, "deleted_at", postgresql_where=DELETED_ROWS, sqlite_where=DELETED_ROWS)
 
 class Repository(abc.ABC):
     @abc.abstractmethod
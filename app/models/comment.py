@@ -1,13 +1,20 @@
 from sqlalchemy import Column, Text, Integer, ForeignKey
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from app.models.base import BaseModel, live_index, deleted_index
 
 class Comment(BaseModel):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Keyset pagination (all, per news item, per author), newest first
+        live_index("ix_comments_live_id", "id"),
+        live_index("ix_comments_news_id_id", "news_id", "id"),
+        live_index("ix_comments_author_id_id", "author_id", "id"),
+        deleted_index("ix_comments_deleted_at"),
+    )
     
     text = Column(Text, nullable=False)
-    news_id = Column(Integer, ForeignKey("news.id"), nullable=False)
-    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), nullable=False)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
     news = relationship("News", back_populates="comments")
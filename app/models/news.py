@@ -1,15 +1,62 @@
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, JSON
-from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from sqlalchemy import Column, DDL, String, Text, Integer, ForeignKey, JSON, Index, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
+from app.models.base import BaseModel, live_index, deleted_index
 
 class News(BaseModel):
     __tablename__ = "news"
+    __table_args__ = (
+        # Keyset pagination of all / an author's news: WHERE [author_id = ? AND] id < ? ORDER BY id DESC
+        live_index("ix_news_live_id", "id"),
+        live_index("ix_news_author_id_id", "author_id", "id"),
+        deleted_index("ix_news_deleted_at"),
+        # content @> / ? filters (PostgreSQL only, content is JSONB there)
+        Index("ix_news_content_gin", "content", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     title = Column(String(200), nullable=False)
-    content = Column(JSON, nullable=False)
-    cover = Column(Text, nullable=True)
-    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Heavy columns, deferred as the "body" group: loaded only by queries that
+    # render them (undefer_group("body"), see crud.news.with_author)
+    content = deferred(Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False), group="body")
+    cover = deferred(Column(Text, nullable=True), group="body")
+    # Plain-text teaser of content for list views, set by CRUDNews on create/update
+    excerpt = Column(Text, nullable=True)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Denormalized, kept in sync by CRUDComment in the same transaction
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     author = relationship("User", back_populates="news")
-    comments = relationship("Comment", back_populates="news", cascade="all, delete-orphan")
\ No newline at end of file
+    comments = relationship("Comment", back_populates="news", cascade="all, delete-orphan", passive_deletes=True)
+
+# Full-text search index, outside the mapped columns because it differs per
+# database (see CRUDNews.search):
+# - PostgreSQL: generated tsvector over the title (weight A) and the string
+#   values of content (weight B), with a GIN index
+# - SQLite: FTS5 table news_fts (rowid = news.id) kept in sync by triggers
+NEWS_FTS_BODY_SQLITE = "(SELECT group_concat(value, ' ') FROM json_tree({row}.content) WHERE type = 'text')"
+
+SEARCH_DDL_POSTGRESQL = [
+    "ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(jsonb_to_tsvector('english', content, '[\"string\"]'), 'B')) STORED",
+    "CREATE INDEX ix_news_search_vector ON news USING gin (search_vector)",
+]
+
+SEARCH_DDL_SQLITE = [
+    "CREATE VIRTUAL TABLE news_fts USING fts5(title, body, tokenize = 'porter unicode61')",
+    "CREATE TRIGGER news_fts_insert AFTER INSERT ON news BEGIN "
+    "INSERT INTO news_fts (rowid, title, body) VALUES (new.id, new.title, "
+    + NEWS_FTS_BODY_SQLITE.format(row="new") + "); END",
+    "CREATE TRIGGER news_fts_delete AFTER DELETE ON news BEGIN "
+    "DELETE FROM news_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER news_fts_update AFTER UPDATE OF title, content ON news BEGIN "
+    "UPDATE news_fts SET title = new.title, body = "
+    + NEWS_FTS_BODY_SQLITE.format(row="new") + " WHERE rowid = new.id; END",
+]
+
+for statement in SEARCH_DDL_POSTGRESQL:
+    event.listen(News.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SEARCH_DDL_SQLITE:
+    event.listen(News.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(News.__table__, "after_drop", DDL("DROP TABLE IF EXISTS news_fts").execute_if(dialect="sqlite"))
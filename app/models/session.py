@@ -1,15 +1,25 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from datetime import datetime
 
 class RefreshSession(BaseModel):
     __tablename__ = "refresh_sessions"
+    __table_args__ = (
+        # Live sessions of a user (user_id = ? AND expires_at > now)
+        Index("ix_refresh_sessions_user_id_expires_at", "user_id", "expires_at"),
+        # Expiry sweeper (expires_at <= now, oldest first)
+        Index("ix_refresh_sessions_expires_at", "expires_at"),
+    )
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    refresh_token = Column(String(512), unique=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # sha256 digest of the refresh token; the token itself is never stored
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False)
     user_agent = Column(String(512), nullable=True)
     expires_at = Column(DateTime, nullable=False)
     
+    # Raw token, only set on sessions returned by AuthService.create_refresh_session
+    refresh_token = None
+
     # Use string-based relationship to avoid circular imports
     user = relationship("User", back_populates="sessions")
\ No newline at end of file
@@ -1,19 +1,35 @@
-from sqlalchemy import Column, String, Boolean, Text
-from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
+from sqlalchemy import Column, String, Boolean, Text, Index, func
+from sqlalchemy.orm import deferred, relationship
+from app.models.base import LIVE_ROWS, BaseModel, deleted_index
 
 class User(BaseModel):
     __tablename__ = "users"
     
     name = Column(String(100), nullable=False)
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    # Stored normalized (see schemas.user.normalize_email); uniqueness and
+    # lookups go through the lower(email) index
+    email = Column(String(255), nullable=False)
     hashed_password = Column(String(255), nullable=True)
     is_verified = Column(Boolean, default=False)
     is_admin = Column(Boolean, default=False)
-    avatar = Column(Text, nullable=True)
+    # May hold a data URL: deferred ("media" group) so authentication and
+    # ownership checks don't load it, see crud.user.with_media
+    avatar = deferred(Column(Text, nullable=True), group="media")
     github_id = Column(String(100), unique=True, nullable=True)
     
-    # Relationships
-    news = relationship("News", back_populates="author", cascade="all, delete-orphan")
-    comments = relationship("Comment", back_populates="author", cascade="all, delete-orphan")
-    sessions = relationship("RefreshSession", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    # Relationships. Dependents are removed by the database (ON DELETE CASCADE),
+    # passive_deletes keeps the ORM from loading them just to delete them
+    news = relationship("News", back_populates="author", cascade="all, delete-orphan", passive_deletes=True)
+    comments = relationship("Comment", back_populates="author", cascade="all, delete-orphan", passive_deletes=True)
+    sessions = relationship("RefreshSession", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # Live accounts only: the email of an account queued for deletion can
+        # be registered again right away
+        Index(
+            "uq_users_email_lower", func.lower(email), unique=True,
+            postgresql_where=LIVE_ROWS, sqlite_where=LIVE_ROWS,
+        ),
+        # deleted_at marks accounts queued for background deletion (DeletionService)
+        deleted_index("ix_users_pending_deletion"),
+    )
\ No newline at end of file
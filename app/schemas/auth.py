@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional
-from app.schemas.user import User
+from app.schemas.user import User, normalize_email
 
 class Token(BaseModel):
     access_token: str
@@ -17,6 +17,11 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
+    @field_validator('email')
+    @classmethod
+    def validate_email(cls, v):
+        return normalize_email(v)
+
 class RegisterRequest(BaseModel):
     name: str
     email: str
@@ -35,7 +40,7 @@ class RegisterRequest(BaseModel):
     def validate_email(cls, v):
         if '@' not in v:
             raise ValueError('Email must contain @')
-        return v.lower()
+        return normalize_email(v)
 
 class RefreshRequest(BaseModel):
     refresh_token: str
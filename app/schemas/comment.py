@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from .user import User
 
 class CommentBase(BaseModel):
@@ -12,6 +12,9 @@ class CommentCreate(CommentBase):
 class CommentUpdate(CommentBase):
     pass
 
+class CommentBulkDelete(BaseModel):
+    ids: List[int]
+
 class Comment(CommentBase):
     id: int
     news_id: int
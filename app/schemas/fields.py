@@ -0,0 +1,59 @@
+from datetime import datetime
+from functools import lru_cache
+from inspect import isclass
+from typing import Any, FrozenSet, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+# Marks fields without a default: the attribute must exist on the object
+_REQUIRED = object()
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """
+    (model, many) when the field holds a model, Optional[model] or List[model]
+    """
+    origin = get_origin(annotation)
+    if origin is list:
+        inner, _ = _nested_model(get_args(annotation)[0])
+        return inner, inner is not None
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if isclass(annotation) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+def _is_str(annotation: Any) -> bool:
+    return annotation is str or (get_origin(annotation) is Union and str in get_args(annotation))
+
+@lru_cache(maxsize=256)
+def _dump_plan(schema: Type[BaseModel]) -> tuple:
+    """
+    (name, nested model, many, is str, default) per field of schema, built once per schema
+    """
+    plan = []
+    for name, field in schema.model_fields.items():
+        nested, many = _nested_model(field.annotation)
+        default = _REQUIRED if field.is_required() else field.get_default(call_default_factory=True)
+        plan.append((name, nested, many, _is_str(field.annotation), default))
+    return tuple(plan)
+
+def dump_trusted(schema: Type[BaseModel], obj: Any, fields: Optional[FrozenSet[str]] = None) -> dict:
+    """
+    schema's fields (or the `fields` subset, for ?fields=) read straight from a
+    trusted object such as a loaded ORM row, without validating them: nested
+    models are dumped the same way, other values are kept as they are
+    (datetimes included, FastJSONResponse renders them in ISO format).
+    """
+    data = {}
+    for name, nested, many, is_str, default in _dump_plan(schema):
+        if fields is not None and name not in fields:
+            continue
+        value = getattr(obj, name) if default is _REQUIRED else getattr(obj, name, default)
+        if nested is not None and value is not None:
+            value = [dump_trusted(nested, item) for item in value] if many else dump_trusted(nested, value)
+        elif is_str and isinstance(value, datetime):
+            # str fields fed datetimes by a convert_datetime_to_string validator
+            value = value.isoformat()
+        data[name] = value
+    return data
@@ -18,10 +18,35 @@ class NewsUpdate(BaseModel):
 
 class News(NewsBase):
     id: int
+    excerpt: Optional[str] = None
     author_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    comment_count: int = 0
     author: User
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class NewsSummary(BaseModel):
+    """
+    List item: the plain-text excerpt instead of the full content
+    """
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    cover: Optional[str] = None
+    author_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    comment_count: int = 0
+    author: User
+
+    class Config:
+        from_attributes = True
+
+class NewsSearchResult(NewsSummary):
+    rank: float
+    # HTML: the text is escaped and matches are wrapped in <b>...</b>
+    title_highlight: str
+    snippet: str
@@ -2,6 +2,12 @@ from pydantic import BaseModel, field_validator
 from typing import Optional
 from datetime import datetime
 
+def normalize_email(email: str) -> str:
+    """
+    Canonical stored/looked-up form of an email (matches the lower(email) index)
+    """
+    return email.strip().lower()
+
 class UserBase(BaseModel):
     name: str
     email: str
@@ -15,7 +21,7 @@ class UserCreate(UserBase):
     def validate_email(cls, v):
         if '@' not in v:
             raise ValueError('Email must contain @')
-        return v
+        return normalize_email(v)
 
 class UserUpdate(BaseModel):
     name: Optional[str] = None
@@ -24,6 +30,15 @@ class UserUpdate(BaseModel):
     is_verified: Optional[bool] = None
     is_admin: Optional[bool] = None
 
+    @field_validator('email')
+    @classmethod
+    def validate_email(cls, v):
+        if v is None:
+            return v
+        if '@' not in v:
+            raise ValueError('Email must contain @')
+        return normalize_email(v)
+
 class User(UserBase):
     id: int
     is_verified: bool
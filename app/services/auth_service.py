@@ -3,10 +3,13 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Request
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
+import hashlib
 import secrets
 
 from app.core.config import settings
+from app.database.unit_of_work import commit
 from app.models.user import User
 from app.models.session import RefreshSession
 from app.schemas.auth import TokenData
@@ -48,6 +51,11 @@ class AuthService:
     def create_refresh_token() -> str:
         return secrets.token_urlsafe(64)
 
+    @staticmethod
+    def hash_refresh_token(refresh_token: str) -> bytes:
+        # Tokens are 512 random bits, so a plain (unsalted) sha256 is enough
+        return hashlib.sha256(refresh_token.encode()).digest()
+
     @staticmethod
     def verify_token(token: str) -> TokenData:
         credentials_exception = HTTPException(
@@ -80,35 +88,89 @@ class AuthService:
             print(f"Token verification failed: {e}")
             raise credentials_exception
 
+    @staticmethod
+    def user_id_from_token(token: str) -> Optional[int]:
+        """
+        User id of a valid access token, None otherwise. Never raises: used
+        to key replica stickiness on routes that don't require authentication.
+        """
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            return int(payload["sub"])
+        except (JWTError, KeyError, TypeError, ValueError):
+            return None
+
     @staticmethod
     def create_refresh_session(db: Session, user_id: int, user_agent: Optional[str] = None) -> RefreshSession:
+        """
+        The returned session carries the raw token in .refresh_token; only its
+        digest is stored. The user's oldest sessions beyond MAX_SESSIONS_PER_USER
+        (and their expired ones) are deleted.
+        """
         refresh_token = AuthService.create_refresh_token()
         expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        
+
+        # Sessions share one lifetime, so the newest expire last
+        keep = select(RefreshSession.id).where(
+            RefreshSession.user_id == user_id,
+            RefreshSession.expires_at > datetime.utcnow()
+        ).order_by(RefreshSession.expires_at.desc()).limit(settings.MAX_SESSIONS_PER_USER - 1)
+        db.execute(
+            delete(RefreshSession).where(
+                RefreshSession.user_id == user_id,
+                RefreshSession.id.not_in(keep.scalar_subquery())
+            )
+        )
+
         session = RefreshSession(
             user_id=user_id,
-            refresh_token=refresh_token,
+            token_hash=AuthService.hash_refresh_token(refresh_token),
             user_agent=user_agent,
             expires_at=expires_at
         )
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        commit(db)
+        session.refresh_token = refresh_token
         return session
 
     @staticmethod
     def get_refresh_session(db: Session, refresh_token: str) -> Optional[RefreshSession]:
         return db.query(RefreshSession).filter(
-            RefreshSession.refresh_token == refresh_token,
+            RefreshSession.token_hash == AuthService.hash_refresh_token(refresh_token),
             RefreshSession.expires_at > datetime.utcnow()
         ).first()
 
     @staticmethod
     def delete_refresh_session(db: Session, refresh_token: str) -> None:
-        session = db.query(RefreshSession).filter(RefreshSession.refresh_token == refresh_token).first()
-        if session:
-            db.delete(session)
+        db.execute(
+            delete(RefreshSession).where(
+                RefreshSession.token_hash == AuthService.hash_refresh_token(refresh_token)
+            )
+        )
+        commit(db)
+
+    @staticmethod
+    def delete_expired_sessions(db: Session, batch_size: int) -> int:
+        """
+        Delete expired refresh sessions, batch_size rows per transaction.
+        Returns the number of deleted sessions.
+        """
+        deleted = 0
+        while True:
+            ids = list(db.scalars(
+                select(RefreshSession.id)
+                .where(RefreshSession.expires_at <= datetime.utcnow())
+                .order_by(RefreshSession.expires_at)
+                .limit(batch_size)
+            ))
+            if not ids:
+                return deleted
+            db.execute(
+                delete(RefreshSession).where(RefreshSession.id.in_(ids)),
+                execution_options={"synchronize_session": False},
+            )
             db.commit()
+            deleted += len(ids)
 
     @staticmethod
     def get_user_sessions(db: Session, user_id: int) -> list[RefreshSession]:
@@ -0,0 +1,205 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.crud import comment as comment_crud
+from app.crud import news as news_crud
+from app.models.comment import Comment
+from app.models.news import News
+from app.models.session import RefreshSession
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+class DeletionService:
+    """
+    Removes accounts marked with users.deleted_at in bounded batches, one short
+    transaction per batch, so no request holds locks over a whole account.
+    Order: sessions, the user's comments, comments on the user's news, news,
+    then the user row itself.
+
+    Also purges soft-deleted news and comments once they are older than
+    SOFT_DELETE_RETENTION_DAYS, and sweeps expired refresh sessions.
+    """
+
+    # Progress of accounts processed by this process: {user_id: {...}}.
+    # Only the last FINISHED_KEPT completed deletions are kept.
+    progress: Dict[int, dict] = {}
+    FINISHED_KEPT = 100
+    _wake: Optional[asyncio.Event] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def pending_user_ids(db: Session) -> List[int]:
+        return list(db.scalars(select(User.id).where(User.deleted_at.is_not(None)).order_by(User.deleted_at)))
+
+    @staticmethod
+    def comment_criteria(user_id: int) -> tuple:
+        """
+        The comments removed with a user: their own and those on their news
+        """
+        return (
+            Comment.author_id == user_id,
+            Comment.news_id.in_(select(News.id).where(News.author_id == user_id)),
+        )
+
+    @classmethod
+    def remaining(cls, db: Session, user_id: int) -> Dict[str, int]:
+        return {
+            "sessions": db.scalar(select(func.count()).where(RefreshSession.user_id == user_id)),
+            "comments": db.scalar(select(func.count()).where(or_(*cls.comment_criteria(user_id)))),
+            "news": db.scalar(select(func.count()).where(News.author_id == user_id)),
+        }
+
+    @classmethod
+    def delete_batch(cls, db: Session, user_id: int, batch_size: int) -> bool:
+        """
+        Delete up to batch_size dependent rows (or the user row once none are
+        left) and commit. Returns False when the account is fully removed.
+        """
+        state = cls.progress.setdefault(user_id, {
+            "deleted": {"sessions": 0, "comments": 0, "news": 0},
+            "started_at": datetime.utcnow(),
+            "finished_at": None,
+        })
+        deleted = state["deleted"]
+
+        session_ids = list(db.scalars(
+            select(RefreshSession.id).where(RefreshSession.user_id == user_id).limit(batch_size)
+        ))
+        if session_ids:
+            db.execute(
+                delete(RefreshSession).where(RefreshSession.id.in_(session_ids)),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+            deleted["sessions"] += len(session_ids)
+            return True
+
+        # Own comments first (releases comment_count on other authors' news),
+        # then comments on the user's news, so deleting a news item never
+        # cascades to an unbounded number of rows
+        for criteria in cls.comment_criteria(user_id):
+            comment_ids = list(db.scalars(select(Comment.id).where(criteria).limit(batch_size)))
+            if comment_ids:
+                deleted["comments"] += comment_crud.comment.purge_many(db, comment_ids)
+                return True
+
+        news_ids = list(db.scalars(select(News.id).where(News.author_id == user_id).limit(batch_size)))
+        if news_ids:
+            db.execute(
+                delete(News).where(News.id.in_(news_ids)),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+            deleted["news"] += len(news_ids)
+            return True
+
+        db.execute(delete(User).where(User.id == user_id, User.deleted_at.is_not(None)))
+        db.commit()
+        state["finished_at"] = datetime.utcnow()
+        cls._prune_progress()
+        return False
+
+    @classmethod
+    def _prune_progress(cls) -> None:
+        finished = [user_id for user_id, state in cls.progress.items() if state["finished_at"] is not None]
+        for user_id in finished[:max(len(finished) - cls.FINISHED_KEPT, 0)]:
+            cls.progress.pop(user_id, None)
+
+    @classmethod
+    def run_pending(cls, batch_size: int) -> int:
+        """
+        Process every account currently marked deleted. Returns how many were removed.
+        """
+        from app.database.session import SessionLocal
+
+        # Writes only: keep every read of the worker on the primary
+        with SessionLocal(info={"use_primary": True}) as db:
+            user_ids = cls.pending_user_ids(db)
+            for user_id in user_ids:
+                while cls.delete_batch(db, user_id, batch_size):
+                    pass
+        return len(user_ids)
+
+    @staticmethod
+    def purge_soft_deleted(db: Session, deleted_before: datetime, batch_size: int) -> Dict[str, int]:
+        """
+        Physically delete soft-deleted comments, then news, in batches of
+        batch_size (one transaction each). Returns the number of purged rows.
+        """
+        purged = {"comments": 0, "news": 0}
+        for name, crud in (("comments", comment_crud.comment), ("news", news_crud.news)):
+            while True:
+                ids = crud.purgeable_ids(db, deleted_before, batch_size)
+                if not ids:
+                    break
+                purged[name] += crud.purge_many(db, ids)
+        return purged
+
+    @classmethod
+    def run_purge(cls, batch_size: int) -> Dict[str, int]:
+        from app.database.session import SessionLocal
+
+        deleted_before = datetime.now(timezone.utc) - timedelta(days=settings.SOFT_DELETE_RETENTION_DAYS)
+        with SessionLocal(info={"use_primary": True}) as db:
+            return cls.purge_soft_deleted(db, deleted_before, batch_size)
+
+    @staticmethod
+    def run_session_sweep(batch_size: int) -> int:
+        from app.database.session import SessionLocal
+
+        with SessionLocal(info={"use_primary": True}) as db:
+            return AuthService.delete_expired_sessions(db, batch_size)
+
+    @classmethod
+    def wake(cls) -> None:
+        """
+        Start processing now instead of at the next poll. Callable from any
+        thread; call it once the deletion mark is committed, or the worker may
+        scan too early and go back to sleep.
+        """
+        if cls._wake is not None and cls._loop is not None:
+            # asyncio.Event isn't thread-safe: set it on the worker's loop
+            cls._loop.call_soon_threadsafe(cls._wake.set)
+
+    @classmethod
+    async def run_worker(cls) -> None:
+        cls._loop = asyncio.get_running_loop()
+        cls._wake = asyncio.Event()
+        while True:
+            try:
+                await run_in_threadpool(cls.run_pending, settings.DELETION_BATCH_SIZE)
+            except Exception as e:
+                print(f"Background deletion failed: {e}")
+            try:
+                await asyncio.wait_for(cls._wake.wait(), timeout=settings.DELETION_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            cls._wake.clear()
+
+    @classmethod
+    async def run_purge_worker(cls) -> None:
+        while True:
+            try:
+                purged = await run_in_threadpool(cls.run_purge, settings.DELETION_BATCH_SIZE)
+                if any(purged.values()):
+                    print(f"Purged soft-deleted rows: {purged}")
+            except Exception as e:
+                print(f"Purge of soft-deleted rows failed: {e}")
+            await asyncio.sleep(settings.PURGE_INTERVAL)
+
+    @classmethod
+    async def run_session_sweeper(cls) -> None:
+        while True:
+            try:
+                swept = await run_in_threadpool(cls.run_session_sweep, settings.DELETION_BATCH_SIZE)
+                if swept:
+                    print(f"Deleted expired refresh sessions: {swept}")
+            except Exception as e:
+                print(f"Refresh session sweep failed: {e}")
+            await asyncio.sleep(settings.SESSION_SWEEP_INTERVAL)
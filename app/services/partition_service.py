@@ -0,0 +1,129 @@
+import asyncio
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+# comments_p202610 holds October 2026; comments_before_202611 is the original
+# table attached as the partition for everything before November 2026
+MONTHLY_PARTITION = re.compile(r"^comments_p(\d{4})(\d{2})$")
+LEGACY_PARTITION = re.compile(r"^comments_before_(\d{4})(\d{2})$")
+
+def _month_start(day: date, months: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+class PartitionService:
+    """
+    Optional (PostgreSQL only) monthly range partitioning of comments by
+    created_at. The table is converted by migration 0009 (run with
+    -x comments_partitioned=true); this service maintains the partitions
+    whenever the table is partitioned, so inserts never run out of them.
+    The ORM mapping is unchanged: ids stay unique through the shared
+    sequence, the table's primary key becomes (id, created_at).
+    Lists page by id, not created_at, so they are not pruned to a partition:
+    they read every partition's (news_id, id)/(id) index through a
+    MergeAppend that stops after LIMIT rows. Retention drops whole partitions
+    instead of deleting rows.
+    """
+
+    @staticmethod
+    def is_partitioned(conn: Connection) -> bool:
+        return bool(conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'comments'::regclass)"
+        )))
+
+    @staticmethod
+    def partitions(conn: Connection) -> List[str]:
+        return list(conn.scalars(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'comments'::regclass ORDER BY c.relname"
+        )))
+
+    @staticmethod
+    def partition_range(name: str) -> Optional[Tuple[Optional[date], date]]:
+        """
+        (start, end) months covered by a partition; start is None for the legacy one
+        """
+        match = MONTHLY_PARTITION.match(name)
+        if match:
+            start = date(int(match[1]), int(match[2]), 1)
+            return start, _month_start(start, 1)
+        match = LEGACY_PARTITION.match(name)
+        if match:
+            return None, date(int(match[1]), int(match[2]), 1)
+        return None
+
+    @classmethod
+    def create_future_partitions(cls, conn: Connection, today: date, months_ahead: int) -> List[str]:
+        """
+        Monthly partitions up to months_ahead months ahead, from the end of
+        the covered range (months missed while maintenance wasn't running are
+        filled in) or the current month. Returns the created names.
+        """
+        start = max(
+            (end for end in (r[1] for r in map(cls.partition_range, cls.partitions(conn)) if r)),
+            default=_month_start(today),
+        )
+        created = []
+        while start <= _month_start(today, months_ahead):
+            name = f"comments_p{start:%Y%m}"
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF comments "
+                f"FOR VALUES FROM ('{start}') TO ('{_month_start(start, 1)}')"
+            ))
+            created.append(name)
+            start = _month_start(start, 1)
+        return created
+
+    @classmethod
+    def drop_expired_partitions(cls, conn: Connection, today: date, retention_months: int) -> List[str]:
+        """
+        Detach and drop partitions entirely older than retention_months,
+        after releasing their live comments from News.comment_count
+        """
+        cutoff = _month_start(today, -retention_months)
+        dropped = []
+        for name in cls.partitions(conn):
+            bounds = cls.partition_range(name)
+            if bounds is None or bounds[1] > cutoff:
+                continue
+            conn.execute(text(
+                f"UPDATE news SET comment_count = news.comment_count - expired.n "
+                f"FROM (SELECT news_id, count(*) AS n FROM {name} "
+                f"WHERE deleted_at IS NULL GROUP BY news_id) AS expired "
+                f"WHERE news.id = expired.news_id"
+            ))
+            conn.execute(text(f"ALTER TABLE comments DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+        return dropped
+
+    @classmethod
+    def maintain(cls, engine: Engine, today: Optional[date] = None) -> None:
+        if engine.dialect.name != "postgresql":
+            return
+        today = today or date.today()
+        with engine.begin() as conn:
+            if not cls.is_partitioned(conn):
+                return
+            created = cls.create_future_partitions(conn, today, settings.COMMENT_PARTITIONS_AHEAD)
+            dropped = []
+            if settings.COMMENT_PARTITION_RETENTION_MONTHS:
+                dropped = cls.drop_expired_partitions(conn, today, settings.COMMENT_PARTITION_RETENTION_MONTHS)
+        if created or dropped:
+            print(f"Comment partitions created: {created}, dropped: {dropped}")
+
+    @classmethod
+    async def run_worker(cls, engine: Engine) -> None:
+        while True:
+            try:
+                await run_in_threadpool(cls.maintain, engine)
+            except Exception as e:
+                print(f"Comment partition maintenance failed: {e}")
+            await asyncio.sleep(settings.PARTITION_MAINTENANCE_INTERVAL)
@@ -0,0 +1,38 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+
+from app.database.session import SessionLocal
+from app.models.user import User
+from app.models.news import News
+from app.models.comment import Comment
+from app.models.session import RefreshSession
+from app.crud.news import make_excerpt, news as news_crud
+
+# Fill news.excerpt for rows written before the column existed (soft-deleted
+# ones included), BATCH_SIZE rows per transaction. Safe to re-run.
+BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", "500"))
+
+print("Backfilling news excerpts...")
+total = 0
+last_id = 0
+with SessionLocal(info={"use_primary": True}) as db:
+    while True:
+        rows = db.execute(
+            select(News.id, News.content)
+            .where(News.id > last_id, News.excerpt.is_(None))
+            .order_by(News.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        # touch=False: updated_at stays, the articles weren't edited
+        news_crud.update_many(
+            db, [{"id": id, "excerpt": make_excerpt(content)} for id, content in rows], touch=False
+        )
+        total += len(rows)
+        last_id = rows[-1].id
+        print(f"   {total} news updated")
+print(f"✅ Excerpts backfilled for {total} news")
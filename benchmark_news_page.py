@@ -0,0 +1,90 @@
+import os
+import sys
+import timeit
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Throwaway database unless one is given explicitly
+os.environ.setdefault("DATABASE_URL", "sqlite:////tmp/benchmark_news.db")
+
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.main import app
+from app.core.responses import FastJSONResponse, orjson
+from app.crud import news as news_crud
+from app.database.session import SessionLocal
+from app.schemas.fields import dump_trusted
+from app.schemas.news import News, NewsCreate, NewsSummary
+
+# Serialization cost of one 100-item /api/news/ page: stdlib JSONResponse
+# (the FastAPI default) against FastJSONResponse (orjson), and response_model
+# validation against dump_trusted (api.dependencies.page_response).
+PAGE_SIZE = 100
+ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", "200"))
+
+def seed(db) -> None:
+    if len(news_crud.news.get_all(db, limit=PAGE_SIZE)) >= PAGE_SIZE:
+        return
+    content = {
+        "text": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20,
+        "tags": ["politics", "economy", "world"],
+        "blocks": [{"type": "paragraph", "text": "Paragraph %d" % i, "meta": {"level": i}} for i in range(10)],
+    }
+    news_crud.news.create_many(
+        db, [NewsCreate(title=f"News {i}", content=content, cover=None) for i in range(PAGE_SIZE)], author_id=1
+    )
+
+def best_ms(fn) -> float:
+    return min(timeit.repeat(fn, number=ROUNDS, repeat=5)) / ROUNDS * 1000
+
+def report(label: str, baseline: float, fast: float) -> None:
+    print(f"{label:<48} {baseline:8.3f} ms {fast:8.3f} ms {baseline / fast:6.1f}x")
+
+with TestClient(app) as client:
+    with SessionLocal() as db:
+        seed(db)
+        items = news_crud.news.get_all(db, limit=PAGE_SIZE, options=news_crud.with_author_summary())
+        adapter = TypeAdapter(List[NewsSummary])
+        models = adapter.validate_python(items, from_attributes=True)
+        # What the route hands to the response class (json mode: datetimes as str)
+        json_content = adapter.dump_python(models, mode="json")
+        # Python mode keeps datetimes, which only FastJSONResponse takes as is
+        python_content = adapter.dump_python(models)
+        # Full documents (GET /api/news/?fields=...,content): nested content dicts
+        full_items = news_crud.news.get_all(db, limit=PAGE_SIZE, options=news_crud.with_author())
+        full_adapter = TypeAdapter(List[News])
+        full_content = full_adapter.dump_python(full_adapter.validate_python(full_items, from_attributes=True), mode="json")
+
+    print(f"orjson: {'orjson ' + orjson.__version__ if orjson else 'not installed (stdlib fallback)'}")
+    print(f"{PAGE_SIZE}-item page, {len(JSONResponse(json_content).body)} bytes, best of 5 x {ROUNDS} rounds\n")
+    print(f"{'':<48} {'JSONResponse':>11} {'FastJSON':>11} {'speedup':>7}")
+    report(
+        "render json-mode content",
+        best_ms(lambda: JSONResponse(json_content)),
+        best_ms(lambda: FastJSONResponse(json_content)),
+    )
+    report(
+        "render json-mode content, full documents",
+        best_ms(lambda: JSONResponse(full_content)),
+        best_ms(lambda: FastJSONResponse(full_content)),
+    )
+    report(
+        "python-mode content (+ jsonable_encoder)",
+        best_ms(lambda: JSONResponse(jsonable_encoder(python_content))),
+        best_ms(lambda: FastJSONResponse(python_content)),
+    )
+    with SessionLocal() as db:
+        items = news_crud.news.get_all(db, limit=PAGE_SIZE, options=news_crud.with_author_summary())
+        report(
+            "ORM rows: response_model vs dump_trusted",
+            best_ms(lambda: JSONResponse(adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json"))),
+            best_ms(lambda: FastJSONResponse([dump_trusted(NewsSummary, item) for item in items])),
+        )
+
+    client.get(f"/api/news/?limit={PAGE_SIZE}")
+    request_ms = best_ms(lambda: client.get(f"/api/news/?limit={PAGE_SIZE}"))
+    print(f"\nGET /api/news/?limit={PAGE_SIZE} end to end: {request_ms:.3f} ms")
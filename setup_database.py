@@ -3,14 +3,12 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.database.session import engine
-from app.database.base import Base
-from app.models.user import User
-from app.models.news import News
-from app.models.comment import Comment
+from app.database.schema import init_schema
 
+# Creates the tables on an empty database only; existing ones are migrated
+# with `alembic upgrade head`
 print("Creating database tables in PostgreSQL...")
-Base.metadata.create_all(bind=engine)
-print("✅ All tables created successfully!")
+init_schema(engine)
 
 # Verify tables were created
 from sqlalchemy import text